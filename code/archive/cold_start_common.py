@@ -0,0 +1,271 @@
+# cold_start_common.py
+# Gemeinsamer Teil für Cold-Start-Skripte: CSV laden, Spalten erkennen,
+# per90 + Perzentil-Features und positionsgewichteter Score (pred_score).
+
+import csv
+
+import pandas as pd
+import numpy as np
+
+POS_CODES = {"GK": 0, "DEF": 1, "MID": 2, "FWD": 3}
+
+# Spaltenkandidaten (erste vorhandene gewinnt)
+NAME_COLS = ["web_name", "second_name", "name", "player_name", "first_name"]
+TEAM_COLS = ["team_name", "team", "club", "squad", "team_short"]
+POS_COLS = ["element_type", "position", "pos"]
+PRICE_COLS = ["now_cost", "price", "value", "cost"]
+OWN_COLS = ["selected_by_percent", "selected_by", "ownership"]
+STAT_COLS = [
+    "minutes",
+    "goals_scored",
+    "assists",
+    "clean_sheets",
+    "goals_conceded",
+    "saves",
+    "threat",
+    "creativity",
+    "influence",
+    "ict_index",
+]
+WANTED_COLS = set(NAME_COLS + TEAM_COLS + POS_COLS + PRICE_COLS + OWN_COLS + STAT_COLS)
+PCT_COLS = [
+    "price_pct",
+    "own_pct",
+    "mins_pct",
+    "g90_pct",
+    "a90_pct",
+    "cs90_pct",
+    "gc90_pct",
+    "sv90_pct",
+    "thr_pct",
+    "cre_pct",
+    "inf_pct",
+    "ict_pct",
+]
+
+
+# ----------------- Utils -----------------
+def robust_read_csv(path):
+    tries = [
+        {"engine": "c"},
+        {"sep": None},
+        {"sep": ";", "engine": "python"},
+        {"engine": "python", "on_bad_lines": "skip"},
+        {
+            "engine": "python",
+            "on_bad_lines": "skip",
+            "encoding": "utf-8",
+            "encoding_errors": "ignore",
+        },
+    ]
+    last = Exception(f"Failed to read CSV: {path}")
+    for kw in tries:
+        try:
+            return pd.read_csv(path, **kw)
+        except Exception as e:
+            last = e
+    raise last
+
+
+def read_pool_csv(path):
+    # Trennzeichen einmal aus dem Kopf schnüffeln, dann nur benötigte Spalten
+    # mit der C-Engine lesen; robust_read_csv nur als Fallback
+    try:
+        with open(path, "rb") as f:
+            sample = f.read(8192).decode("utf-8", errors="ignore")
+        if "\n" in sample:
+            sample = sample[: sample.rindex("\n") + 1]
+        sep = csv.Sniffer().sniff(sample, delimiters=",;\t|").delimiter
+        return pd.read_csv(
+            path, sep=sep, engine="c", usecols=lambda c: c in WANTED_COLS
+        )
+    except Exception:
+        return robust_read_csv(path)
+
+
+def map_pos(col):
+    num = pd.to_numeric(col, errors="coerce")
+    from_num = num.map({1: "GK", 2: "DEF", 3: "MID", 4: "FWD"})
+    from_str = (
+        col.astype(str)
+        .str.strip()
+        .str.upper()
+        .map(
+            {
+                "GK": "GK",
+                "GKP": "GK",
+                "DEF": "DEF",
+                "D": "DEF",
+                "MID": "MID",
+                "M": "MID",
+                "FWD": "FWD",
+                "ST": "FWD",
+                "F": "FWD",
+            }
+        )
+    )
+    return from_num.fillna(from_str)
+
+
+def pos_masks(pos):
+    # einmal kodieren, danach nur noch int8-Vergleiche statt String-Scans
+    # pos ist category: nur die Kategorien über POS_CODES abbilden, dann mit
+    # cat.codes indizieren; das angehängte -1 fängt Code -1 (NaN) ab
+    cat = pos.astype("category").cat
+    lut = np.array([POS_CODES.get(c, -1) for c in cat.categories] + [-1], dtype=np.int8)
+    codes = lut[cat.codes.to_numpy()]
+    return {p: codes == c for p, c in POS_CODES.items()}
+
+
+def pct_rank(a):
+    # Perzentil-Rang wie Series.rank(pct=True, method="average"), aber über
+    # einen einzigen Sort in NumPy; NaN -> 0.0
+    a = np.asarray(a, dtype=np.float64)
+    out = np.zeros(a.size)
+    valid = ~np.isnan(a)
+    n = int(valid.sum())
+    if n:
+        _, inv, counts = np.unique(a[valid], return_inverse=True, return_counts=True)
+        avg_rank = np.cumsum(counts) - (counts - 1) / 2.0
+        out[valid] = avg_rank[inv] / n
+    return out
+
+
+def to_price(series):
+    # FPL now_cost in Zehnteln; Skala ist pro CSV einheitlich -> einmal prüfen
+    x = pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64)
+    valid = x[~np.isnan(x)]
+    if valid.size and np.median(valid) > 25:
+        return x / 10.0
+    return x
+
+
+def per90(block, minutes):
+    # block: (n, k)-Matrix, alle Spalten in einem Divide; keine Minuten -> 0.0
+    denom = np.where(minutes > 0, minutes / 90.0, np.nan)
+    return np.nan_to_num(block / denom[:, None], nan=0.0)
+
+
+# ----------------- Daten laden -----------------
+def load_pool(csv_path):
+    """CSV -> (pool, has_team); pool enthält Perzentil-Features + nailed_pct."""
+    df = read_pool_csv(csv_path)
+
+    name_col = next((c for c in NAME_COLS if c in df.columns), None)
+    team_col = next((c for c in TEAM_COLS if c in df.columns), None)
+    pos_col = next((c for c in POS_COLS if c in df.columns), None)
+    price_col = next((c for c in PRICE_COLS if c in df.columns), None)
+    own_col = next((c for c in OWN_COLS if c in df.columns), None)
+
+    if not all([name_col, pos_col, price_col]):
+        raise ValueError(
+            "CSV braucht name/web_name, element_type/position, now_cost/price/value"
+        )
+
+    pool = pd.DataFrame()
+    pool["name"] = df[name_col].astype(str)
+    has_team = team_col is not None
+    pool["team"] = df[team_col].astype(str) if has_team else "NA"
+    pool["pos"] = map_pos(df[pos_col])
+    pool = pool[~pool["pos"].isna()]
+    pool["price"] = to_price(df[price_col]).astype(float)
+    pool = pool[pool["price"] > 0]
+    if own_col:
+        own = df[own_col].astype(str).str.replace("%", "", regex=False)
+        pool["own"] = pd.to_numeric(own, errors="coerce").fillna(0.0)
+    else:
+        pool["own"] = 0.0
+
+    # fehlende Statistik-Spalten -> 0, vorhandene NaN bleiben NaN
+    stats = df.reindex(columns=STAT_COLS, fill_value=0).apply(
+        pd.to_numeric, errors="coerce"
+    )
+    raw = stats.reindex(pool.index).to_numpy(dtype=np.float64)
+
+    # Features (Perzentile) – ein Block statt 12 einzelner Series
+    feat = np.column_stack(
+        [
+            pool["price"].to_numpy(dtype=np.float64),
+            pool["own"].to_numpy(dtype=np.float64),
+            raw[:, 0],
+            per90(raw[:, 1:6], raw[:, 0]),
+            raw[:, 6:],
+        ]
+    )
+    pct = np.empty_like(feat)
+    for k in range(feat.shape[1]):
+        pct[:, k] = pct_rank(feat[:, k])
+    pool[PCT_COLS] = pct.astype(np.float32)
+
+    # kompakte Dtypes: Kategorien statt Python-Strings
+    pool["pos"] = pool["pos"].astype("category")
+    pool["team"] = pool["team"].astype("category")
+
+    # Nailedness (0..1)
+    pool["nailed_pct"] = (
+        0.5 * pool["mins_pct"] + 0.3 * pool["own_pct"] + 0.2 * pool["price_pct"]
+    ).clip(0, 1)
+    return pool, has_team
+
+
+# ----------------- Score je Position -----------------
+# spaltenweise statt pool.apply(..., axis=1)
+def score_pool(pool):
+    pct = {
+        c: pool[c].to_numpy(dtype=np.float32)
+        for c in [
+            "g90_pct",
+            "a90_pct",
+            "cs90_pct",
+            "gc90_pct",
+            "sv90_pct",
+            "thr_pct",
+            "cre_pct",
+            "inf_pct",
+            "mins_pct",
+            "own_pct",
+            "price_pct",
+        ]
+    }
+    mid = (
+        3.0 * pct["g90_pct"]
+        + 2.0 * pct["a90_pct"]
+        + 1.2 * pct["thr_pct"]
+        + 1.0 * pct["cre_pct"]
+        + 0.8 * pct["inf_pct"]
+        + 0.3 * pct["mins_pct"]
+        + 0.4 * pct["own_pct"]
+        + 0.3 * pct["price_pct"]
+    )
+    fwd = (
+        3.2 * pct["g90_pct"]
+        + 1.8 * pct["a90_pct"]
+        + 1.0 * pct["thr_pct"]
+        + 0.6 * pct["inf_pct"]
+        + 0.3 * pct["mins_pct"]
+        + 0.3 * pct["own_pct"]
+        + 0.3 * pct["price_pct"]
+    )
+    def_ = (
+        1.5 * pct["cs90_pct"]
+        - 0.2 * pct["gc90_pct"]
+        + 0.6 * pct["thr_pct"]
+        + 0.4 * pct["mins_pct"]
+        + 0.3 * pct["own_pct"]
+        + 0.3 * pct["price_pct"]
+    )
+    gk = (
+        1.8 * pct["cs90_pct"]
+        + 0.4 * pct["sv90_pct"]
+        - 0.3 * pct["gc90_pct"]
+        + 0.4 * pct["mins_pct"]
+        + 0.3 * pct["own_pct"]
+        + 0.3 * pct["price_pct"]
+    )
+    masks = pos_masks(pool["pos"])
+    pool["pred_score"] = np.select(
+        [masks["MID"], masks["FWD"], masks["DEF"], masks["GK"]],
+        [mid, fwd, def_, gk],
+        default=0.0,
+    )
+    return pool
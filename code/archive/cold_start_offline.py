@@ -4,10 +4,21 @@
 # Formation 3-5-2, volle Bank, Budget < 100, max. 3 pro Klub (wenn Teamspalte vorhanden)
 
 import sys
-import pandas as pd
 import numpy as np
 from collections import defaultdict, Counter
 
+from cold_start_common import load_pool, pos_masks, score_pool
+
+try:
+    from numba import njit  # optional
+except Exception:  # pragma: no cover - optional dependency
+    njit = None
+
+try:
+    import pulp  # optional, nur für --ilp
+except Exception:  # pragma: no cover - optional dependency
+    pulp = None
+
 # ----------------- Konfiguration -----------------
 CSV_PATH_DEFAULT = "data/cleaned_players_2025-26.csv"
 BUDGET = 100.0
@@ -26,66 +37,6 @@ MAX_CHEAP_DEF_IN_XI = 1  # max. x × £4.0-DEF in der XI
 
 
 # ----------------- Utils -----------------
-def robust_read_csv(path):
-    tries = [
-        {"engine": "c"},
-        {"sep": None},
-        {"sep": ";", "engine": "python"},
-        {"engine": "python", "on_bad_lines": "skip"},
-        {
-            "engine": "python",
-            "on_bad_lines": "skip",
-            "encoding": "utf-8",
-            "encoding_errors": "ignore",
-        },
-    ]
-    last = Exception(f"Failed to read CSV: {path}")
-    for kw in tries:
-        try:
-            return pd.read_csv(path, **kw)
-        except Exception as e:
-            last = e
-    raise last
-
-
-def map_pos(v):
-    try:
-        v = int(v)
-        return {1: "GK", 2: "DEF", 3: "MID", 4: "FWD"}.get(v)
-    except Exception:
-        s = str(v).strip().upper()
-        return {
-            "GK": "GK",
-            "GKP": "GK",
-            "DEF": "DEF",
-            "D": "DEF",
-            "MID": "MID",
-            "M": "MID",
-            "FWD": "FWD",
-            "ST": "FWD",
-            "F": "FWD",
-        }.get(s)
-
-
-def pct_rank(s):
-    return s.rank(pct=True, method="average").fillna(0.0)
-
-
-def to_price(series):
-    x = pd.to_numeric(series, errors="coerce")
-    return np.where(x > 25, x / 10.0, x)  # FPL now_cost in Zehnteln
-
-
-def to_float(series):
-    return pd.to_numeric(series, errors="coerce")
-
-
-def per90(col, minutes):
-    m = minutes.copy()
-    m = m.where(m > 0, np.nan)
-    return col / (m / 90.0)
-
-
 def bench_reserve_cost():
     base = (
         BENCH.get("GK", 0) * BENCH_MIN["GK"]
@@ -97,202 +48,59 @@ def bench_reserve_cost():
 
 
 # ----------------- Daten laden -----------------
-CSV_PATH = sys.argv[1] if len(sys.argv) > 1 else CSV_PATH_DEFAULT
-df = robust_read_csv(CSV_PATH)
-
-name_col = next(
-    (
-        c
-        for c in ["web_name", "second_name", "name", "player_name", "first_name"]
-        if c in df.columns
-    ),
-    None,
-)
-team_col = next(
-    (
-        c
-        for c in ["team_name", "team", "club", "squad", "team_short"]
-        if c in df.columns
-    ),
-    None,
-)
-pos_col = next(
-    (c for c in ["element_type", "position", "pos"] if c in df.columns), None
-)
-price_col = next(
-    (c for c in ["now_cost", "price", "value", "cost"] if c in df.columns), None
-)
-own_col = next(
-    (c for c in ["selected_by_percent", "selected_by", "ownership"] if c in df.columns),
-    None,
-)
-
-if not all([name_col, pos_col, price_col]):
-    raise ValueError(
-        "CSV braucht name/web_name, element_type/position, now_cost/price/value"
-    )
-
-pool = pd.DataFrame()
-pool["name"] = df[name_col].astype(str)
-HAS_TEAM = team_col is not None
-pool["team"] = df[team_col].astype(str) if HAS_TEAM else "NA"
-pool["pos"] = df[pos_col].apply(map_pos)
-pool = pool[~pool["pos"].isna()]
-pool["price"] = to_price(df[price_col]).astype(float)
-pool = pool[pool["price"] > 0]
-if own_col:
-    own = df[own_col].astype(str).str.replace("%", "", regex=False)
-    pool["own"] = pd.to_numeric(own, errors="coerce").fillna(0.0)
-else:
-    pool["own"] = 0.0
-
-mins = (
-    to_float(df["minutes"])
-    if "minutes" in df.columns
-    else pd.Series(0, index=pool.index, dtype=float)
-)
-goals = (
-    to_float(df["goals_scored"])
-    if "goals_scored" in df.columns
-    else pd.Series(0, index=pool.index, dtype=float)
-)
-assists = (
-    to_float(df["assists"])
-    if "assists" in df.columns
-    else pd.Series(0, index=pool.index, dtype=float)
-)
-cs = (
-    to_float(df["clean_sheets"])
-    if "clean_sheets" in df.columns
-    else pd.Series(0, index=pool.index, dtype=float)
-)
-gc = (
-    to_float(df["goals_conceded"])
-    if "goals_conceded" in df.columns
-    else pd.Series(0, index=pool.index, dtype=float)
-)
-saves = (
-    to_float(df["saves"])
-    if "saves" in df.columns
-    else pd.Series(0, index=pool.index, dtype=float)
-)
-thr = (
-    to_float(df["threat"])
-    if "threat" in df.columns
-    else pd.Series(0, index=pool.index, dtype=float)
-)
-cre = (
-    to_float(df["creativity"])
-    if "creativity" in df.columns
-    else pd.Series(0, index=pool.index, dtype=float)
-)
-inf_ = (
-    to_float(df["influence"])
-    if "influence" in df.columns
-    else pd.Series(0, index=pool.index, dtype=float)
-)
-ict = (
-    to_float(df["ict_index"])
-    if "ict_index" in df.columns
-    else pd.Series(0, index=pool.index, dtype=float)
-)
+ARGS = [a for a in sys.argv[1:] if not a.startswith("--")]
+CSV_PATH = ARGS[0] if ARGS else CSV_PATH_DEFAULT
+USE_ILP = "--ilp" in sys.argv[1:]
+if USE_ILP and pulp is None:
+    print("[cold_start] PuLP nicht installiert -> Greedy statt ILP", file=sys.stderr)
+    USE_ILP = False
+pool, HAS_TEAM = load_pool(CSV_PATH)
+pool = score_pool(pool)
 
-g90, a90 = per90(goals, mins).fillna(0.0), per90(assists, mins).fillna(0.0)
-cs90, gc90, sv90 = (
-    per90(cs, mins).fillna(0.0),
-    per90(gc, mins).fillna(0.0),
-    per90(saves, mins).fillna(0.0),
-)
 
-# Features (Perzentile)
-pool["price_pct"] = pct_rank(pool["price"])
-pool["own_pct"] = pct_rank(pool["own"])
-pool["mins_pct"] = pct_rank(mins)
-pool["g90_pct"] = pct_rank(g90)
-pool["a90_pct"] = pct_rank(a90)
-pool["cs90_pct"] = pct_rank(cs90)
-pool["gc90_pct"] = pct_rank(gc90)
-pool["sv90_pct"] = pct_rank(sv90)
-pool["thr_pct"] = pct_rank(thr)
-pool["cre_pct"] = pct_rank(cre)
-pool["inf_pct"] = pct_rank(inf_)
-pool["ict_pct"] = pct_rank(ict)
-
-# Nailedness (0..1)
-pool["nailed_pct"] = (
-    0.5 * pool["mins_pct"] + 0.3 * pool["own_pct"] + 0.2 * pool["price_pct"]
-).clip(0, 1)
-
-
-# Score je Position
-def score_row(r):
-    if r["pos"] == "MID":
-        return (
-            3.0 * r["g90_pct"]
-            + 2.0 * r["a90_pct"]
-            + 1.2 * r["thr_pct"]
-            + 1.0 * r["cre_pct"]
-            + 0.8 * r["inf_pct"]
-            + 0.3 * r["mins_pct"]
-            + 0.4 * r["own_pct"]
-            + 0.3 * r["price_pct"]
-        )
-    if r["pos"] == "FWD":
-        return (
-            3.2 * r["g90_pct"]
-            + 1.8 * r["a90_pct"]
-            + 1.0 * r["thr_pct"]
-            + 0.6 * r["inf_pct"]
-            + 0.3 * r["mins_pct"]
-            + 0.3 * r["own_pct"]
-            + 0.3 * r["price_pct"]
-        )
-    if r["pos"] == "DEF":
-        return (
-            1.5 * r["cs90_pct"]
-            - 0.2 * r["gc90_pct"]
-            + 0.6 * r["thr_pct"]
-            + 0.4 * r["mins_pct"]
-            + 0.3 * r["own_pct"]
-            + 0.3 * r["price_pct"]
-        )
-    if r["pos"] == "GK":
-        return (
-            1.8 * r["cs90_pct"]
-            + 0.4 * r["sv90_pct"]
-            - 0.3 * r["gc90_pct"]
-            + 0.4 * r["mins_pct"]
-            + 0.3 * r["own_pct"]
-            + 0.3 * r["price_pct"]
-        )
-    return 0.0
+# ----------------- Team-Auswahl -----------------
+def _cheapest_fill(
+    order, price, name_id, team_id, used, club, k, club_limited, max_per_club
+):
+    # Summe der k günstigsten freien Spieler; order ist nach Preis sortiert
+    cc = club.copy() if club_limited else club
+    rem = 0.0
+    taken = 0
+    for i in order:
+        if used[name_id[i]]:
+            continue
+        if club_limited:
+            t = team_id[i]
+            if cc[t] >= max_per_club:
+                continue
+            cc[t] += 1
+        rem += price[i]
+        taken += 1
+        if taken == k:
+            break
+    return rem
 
 
-pool["pred_score"] = pool.apply(score_row, axis=1)
+if njit is not None:
+    _cheapest_fill = njit(cache=True)(_cheapest_fill)
 
 
-# ----------------- Team-Auswahl -----------------
-def minimal_cost_for(need, used_names, club_count, enforce_club, sorted_pool):
+def minimal_cost_for(need, used, club, club_limited, by_price, price, name_id, team_id):
+    # by_price: Indizes je Position, einmal nach Preis sortiert (build_team)
     rem = 0.0
     for pos, k in need.items():
-        if k <= 0:
-            continue
-        cand = sorted_pool[
-            (sorted_pool["pos"] == pos) & (~sorted_pool["name"].isin(used_names))
-        ]
-        if enforce_club and HAS_TEAM:
-            tmp = []
-            cc = club_count.copy()
-            for _, r in cand.sort_values("price").iterrows():
-                if cc[r["team"]] >= MAX_PER_CLUB:
-                    continue
-                tmp.append(float(r["price"]))
-                cc[r["team"]] += 1
-                if len(tmp) == k:
-                    break
-            rem += sum(tmp)
-        else:
-            rem += cand["price"].nsmallest(k).sum()
+        if k > 0:
+            rem += _cheapest_fill(
+                by_price[pos],
+                price,
+                name_id,
+                team_id,
+                used,
+                club,
+                k,
+                club_limited,
+                MAX_PER_CLUB,
+            )
     return float(rem)
 
 
@@ -301,25 +109,92 @@ def build_team(pool_df):
     sorted_pool = pool_df.sort_values("pred_score", ascending=False).reset_index(
         drop=True
     )
+    masks = pos_masks(sorted_pool["pos"])
+    price_by_pos = {
+        pos: np.sort(sorted_pool.loc[masks[pos], "price"].to_numpy(dtype=float))
+        for pos in FORMATION
+    }
+    # Präfixsummen der Preise: k günstigste je Position ohne Namens-/Klubfilter
+    cheapest_cum = {
+        pos: np.concatenate(([0.0], np.cumsum(prices)))
+        for pos, prices in price_by_pos.items()
+    }
+
+    def cost_lower_bound(need_after):
+        lb = 0.0
+        for p, k in need_after.items():
+            if k > 0:
+                lb += float(cheapest_cum[p][min(k, len(cheapest_cum[p]) - 1)])
+        return lb
+
+    # Spalten als Arrays (SoA); Namen/Klubs als Integer-IDs für den Kernel
+    price_arr = sorted_pool["price"].to_numpy(dtype=np.float64)
+    _, name_id = np.unique(sorted_pool["name"].to_numpy(dtype=str), return_inverse=True)
+    _, team_id = np.unique(sorted_pool["team"].to_numpy(dtype=str), return_inverse=True)
+    name_id = name_id.astype(np.int64)
+    team_id = team_id.astype(np.int64)
+    used = np.zeros(name_id.max() + 1 if name_id.size else 0, dtype=np.bool_)
+    club = np.zeros(team_id.max() + 1 if team_id.size else 0, dtype=np.int64)
+    by_price = {}
+    for pos in FORMATION:
+        idx = np.flatnonzero(masks[pos])
+        by_price[pos] = idx[np.argsort(price_arr[idx], kind="stable")]
+    bench_order = {pos: idx.tolist() for pos, idx in by_price.items()}
+    nailed_ok = (sorted_pool["nailed_pct"].to_numpy() >= MIN_NAILED_PCT).tolist()
+    club_limited = bool(enforce_club and HAS_TEAM)
+    if njit is None:
+        # ohne Numba: Python-Listen sind im Interpreter schneller als Arrays
+        price_arr, name_id, team_id = (
+            price_arr.tolist(),
+            name_id.tolist(),
+            team_id.tolist(),
+        )
+        used, club = used.tolist(), club.tolist()
+        by_price = {pos: idx.tolist() for pos, idx in by_price.items()}
+
+    # Kandidaten je Position als Tupel (Reihenfolge nach pred_score bleibt);
+    # statische Start-Regeln (Nailedness, GK-Preis) einmal als Maske
+    cols = [
+        np.arange(len(sorted_pool)),
+        sorted_pool["name"].to_numpy(dtype=object),
+        sorted_pool["team"].to_numpy(dtype=object),
+        sorted_pool["price"].to_numpy(dtype=float),
+        sorted_pool["pred_score"].to_numpy(dtype=float),
+    ]
+    startable = (sorted_pool["nailed_pct"].to_numpy() >= MIN_NAILED_PCT) & (
+        ~masks["GK"] | (cols[3] >= START_GK_MIN_PRICE)
+    )
+
+    def candidates(mask):
+        return list(zip(*(c[mask].tolist() for c in cols)))
+
+    by_pos = {pos: candidates(masks[pos]) for pos in FORMATION}
+    start_by_pos = {pos: candidates(masks[pos] & startable) for pos in FORMATION}
     need = FORMATION.copy()
     picked = []
+    picked_names = set()
     budget = 0.0
-    club_count = Counter()
     effective_budget = max(0.0, BUDGET - bench_reserve_cost())
     cheap_def_in_xi = 0
 
-    def violates_start_rules(r):
-        if r["nailed_pct"] < MIN_NAILED_PCT:
-            return True
-        if r["pos"] == "GK" and r["price"] < START_GK_MIN_PRICE:
-            return True
-        if (
-            r["pos"] == "DEF"
-            and r["price"] <= 4.0
-            and cheap_def_in_xi >= MAX_CHEAP_DEF_IN_XI
-        ):
-            return True
-        return False
+    def fits_budget(pos, i, price):
+        # need/used kurz in-place anpassen statt pro Kandidat zu kopieren
+        need[pos] -= 1
+        used[name_id[i]] = True
+        try:
+            if budget + price + cost_lower_bound(need) > effective_budget + 1e-9:
+                return False
+            min_rem = minimal_cost_for(
+                need, used, club, club_limited, by_price, price_arr, name_id, team_id
+            )
+            return budget + price + min_rem <= effective_budget + 1e-9
+        finally:
+            need[pos] += 1
+            used[name_id[i]] = False
+
+    def violates_start_rules(pos, price):
+        # Nailedness/GK-Preis sind in start_by_pos bereits vorgefiltert
+        return pos == "DEF" and price <= 4.0 and cheap_def_in_xi >= MAX_CHEAP_DEF_IN_XI
 
     # Pick XI
     for pos in [
@@ -337,35 +212,31 @@ def build_team(pool_df):
     ]:
         if need.get(pos, 0) <= 0:
             continue
-        for _, r in sorted_pool[sorted_pool["pos"] == pos].iterrows():
-            if r["name"] in {p["name"] for p in picked}:
+        for i, name, team, price, score in start_by_pos[pos]:
+            if used[name_id[i]]:
                 continue
-            if violates_start_rules(r):
+            if violates_start_rules(pos, price):
                 continue
-            if enforce_club and club_count[r["team"]] >= MAX_PER_CLUB:
+            if enforce_club and club[team_id[i]] >= MAX_PER_CLUB:
                 continue
-            need_after = need.copy()
-            need_after[pos] -= 1
-            used_names = {p["name"] for p in picked} | {r["name"]}
-            min_rem = minimal_cost_for(
-                need_after, used_names, club_count, enforce_club, sorted_pool
-            )
-            if (budget + float(r["price"]) + min_rem) > (effective_budget + 1e-9):
+            if not fits_budget(pos, i, price):
                 continue
             picked.append(
                 {
-                    "name": r["name"],
-                    "team": r["team"],
+                    "name": name,
+                    "team": team,
                     "pos": pos,
-                    "price": float(r["price"]),
-                    "score": float(r["pred_score"]),
+                    "price": price,
+                    "score": score,
                 }
             )
+            picked_names.add(name)
+            used[name_id[i]] = True
             need[pos] -= 1
-            budget += float(r["price"])
+            budget += price
             if enforce_club:
-                club_count[r["team"]] += 1
-            if r["pos"] == "DEF" and r["price"] <= 4.0:
+                club[team_id[i]] += 1
+            if pos == "DEF" and price <= 4.0:
                 cheap_def_in_xi += 1
             break
 
@@ -386,74 +257,131 @@ def build_team(pool_df):
         ]:
             if need.get(pos, 0) <= 0:
                 continue
-            for _, r in sorted_pool[sorted_pool["pos"] == pos].iterrows():
-                if r["name"] in {p["name"] for p in picked}:
+            for i, name, team, price, score in by_pos[pos]:
+                if used[name_id[i]]:
                     continue
-                if enforce_club and club_count[r["team"]] >= MAX_PER_CLUB:
+                if enforce_club and club[team_id[i]] >= MAX_PER_CLUB:
                     continue
-                need_after = need.copy()
-                need_after[pos] -= 1
-                used_names = {p["name"] for p in picked} | {r["name"]}
-                min_rem = minimal_cost_for(
-                    need_after, used_names, club_count, enforce_club, sorted_pool
-                )
-                if (budget + float(r["price"]) + min_rem) > (effective_budget + 1e-9):
+                if not fits_budget(pos, i, price):
                     continue
                 picked.append(
                     {
-                        "name": r["name"],
-                        "team": r["team"],
+                        "name": name,
+                        "team": team,
                         "pos": pos,
-                        "price": float(r["price"]),
-                        "score": float(r["pred_score"]),
+                        "price": price,
+                        "score": score,
                     }
                 )
+                picked_names.add(name)
+                used[name_id[i]] = True
                 need[pos] -= 1
-                budget += float(r["price"])
+                budget += price
                 if enforce_club:
-                    club_count[r["team"]] += 1
-                if r["pos"] == "DEF" and r["price"] <= 4.0:
+                    club[team_id[i]] += 1
+                if pos == "DEF" and price <= 4.0:
                     cheap_def_in_xi += 1
                 break
 
     xi = picked.copy()
-    xi_names = {p["name"] for p in xi}
-    # Prepare remaining pool for bench selection
-    remaining = sorted_pool[~sorted_pool["name"].isin(xi_names)].copy()
+    # Bank: preis-sortierte Indizes je Position wiederverwenden, XI über used
+    # überspringen (keine Kopie, kein erneutes Sortieren)
+    names, teams, prices, scores = (c.tolist() for c in cols[1:])
     bench = []
+    bench_names = set()
+    live_club_count = Counter(p["team"] for p in xi)
     for pos, cnt in BENCH.items():
+        free = [i for i in bench_order[pos] if not used[name_id[i]]]
+        cand = [i for i in free if nailed_ok[i]] or free
         for _ in range(cnt):
-            cand = remaining[
-                (remaining["pos"] == pos) & (remaining["nailed_pct"] >= MIN_NAILED_PCT)
-            ].sort_values("price")
-            if cand.empty:
-                cand = remaining[remaining["pos"] == pos].sort_values("price")
             chosen = None
-            for _, r in cand.iterrows():
-                if r["name"] in {b["name"] for b in bench}:
+            for i in cand:
+                if names[i] in bench_names:
                     continue
-                if (
-                    enforce_club
-                    and Counter([p["team"] for p in xi] + [b["team"] for b in bench])[
-                        r["team"]
-                    ]
-                    >= MAX_PER_CLUB
-                ):
+                if enforce_club and live_club_count[teams[i]] >= MAX_PER_CLUB:
                     continue
-                if (budget + float(r["price"])) <= (BUDGET + 1e-9):
-                    chosen = r
+                if (budget + prices[i]) <= (BUDGET + 1e-9):
+                    chosen = i
                     break
             if chosen is not None:
                 bench.append(
                     {
-                        "name": chosen["name"],
-                        "team": chosen["team"],
-                        "pos": chosen["pos"],
-                        "price": float(chosen["price"]),
-                        "score": float(chosen["pred_score"]),
+                        "name": names[chosen],
+                        "team": teams[chosen],
+                        "pos": pos,
+                        "price": prices[chosen],
+                        "score": scores[chosen],
                     }
                 )
-                budget += float(chosen["price"])
+                bench_names.add(names[chosen])
+                live_club_count[teams[chosen]] += 1
+                budget += prices[chosen]
+    xi_sorted = sorted(xi, key=lambda x: x["score"], reverse=True)
+    captain = xi_sorted[0]["name"] if xi_sorted else ""
+    vice = xi_sorted[1]["name"] if len(xi_sorted) > 1 else ""
+    return xi, bench, budget, captain, vice, enforce_club
+
+
+def build_team_ilp(pool_df):
+    # Ein 0/1-Programm statt Greedy: x = im 15er-Kader, y = in der Start-XI.
+    # Zielfunktion: XI-Score maximieren, Bank leicht Richtung billig/nailed.
+    enforce_club = (pool_df["team"].nunique() > 1) and HAS_TEAM
+    df = pool_df.reset_index(drop=True)
+    idx = list(df.index)
+    price = df["price"].to_numpy(dtype=float)
+    score = df["pred_score"].to_numpy(dtype=float)
+    nailed = df["nailed_pct"].to_numpy(dtype=float)
+    pos = df["pos"].to_numpy()
+    team = df["team"].to_numpy()
+
+    def solve(strict):
+        prob = pulp.LpProblem("cold_start", pulp.LpMaximize)
+        x = {i: pulp.LpVariable(f"x{i}", cat="Binary") for i in idx}
+        y = {i: pulp.LpVariable(f"y{i}", cat="Binary") for i in idx}
+        prob += pulp.lpSum(score[i] * y[i] for i in idx) - 0.001 * pulp.lpSum(
+            (price[i] - nailed[i]) * (x[i] - y[i]) for i in idx
+        )
+        prob += pulp.lpSum(price[i] * x[i] for i in idx) <= BUDGET
+        for i in idx:
+            prob += y[i] <= x[i]
+        for p in FORMATION:
+            members = [i for i in idx if pos[i] == p]
+            prob += pulp.lpSum(y[i] for i in members) == FORMATION[p]
+            prob += pulp.lpSum(x[i] for i in members) == FORMATION[p] + BENCH.get(p, 0)
+        if enforce_club:
+            for t in set(team):
+                prob += pulp.lpSum(x[i] for i in idx if team[i] == t) <= MAX_PER_CLUB
+        if strict:
+            for i in idx:
+                if nailed[i] < MIN_NAILED_PCT or (
+                    pos[i] == "GK" and price[i] < START_GK_MIN_PRICE
+                ):
+                    prob += y[i] == 0
+            cheap_def = [i for i in idx if pos[i] == "DEF" and price[i] <= 4.0]
+            prob += pulp.lpSum(y[i] for i in cheap_def) <= MAX_CHEAP_DEF_IN_XI
+        prob.solve(pulp.PULP_CBC_CMD(msg=False))
+        if pulp.LpStatus[prob.status] != "Optimal":
+            return None
+        return (
+            [i for i in idx if y[i].value() > 0.5],
+            [i for i in idx if x[i].value() > 0.5 and y[i].value() < 0.5],
+        )
+
+    # Start-Regeln zuerst strikt, sonst wie beim Greedy lockern
+    sol = solve(strict=True) or solve(strict=False) or ([], [])
+
+    def as_dict(i):
+        return {
+            "name": df.at[i, "name"],
+            "team": df.at[i, "team"],
+            "pos": pos[i],
+            "price": float(price[i]),
+            "score": float(score[i]),
+        }
+
+    xi = [as_dict(i) for i in sol[0]]
+    bench = [as_dict(i) for i in sol[1]]
+    budget = sum(p["price"] for p in xi + bench)
     xi_sorted = sorted(xi, key=lambda x: x["score"], reverse=True)
     captain = xi_sorted[0]["name"] if xi_sorted else ""
     vice = xi_sorted[1]["name"] if len(xi_sorted) > 1 else ""
@@ -461,7 +389,9 @@ def build_team(pool_df):
 
 
 # ----------------- Run -----------------
-xi, bench, total_cost, captain, vice, enforce_club = build_team(pool)
+xi, bench, total_cost, captain, vice, enforce_club = (
+    build_team_ilp(pool) if USE_ILP else build_team(pool)
+)
 
 # ----------------- Ausgabe -----------------
 print("# GW1 – Empfehlung (Cold Start offline, 3-5-2)\n")
@@ -488,7 +418,7 @@ print("## Bank")
 for pos in ["GK", "DEF", "MID", "FWD"]:
     cand = [b for b in bench if b["pos"] == pos]
     if cand:
-        b = sorted(cand, key=lambda x: x["price"])[0]
+        b = min(cand, key=lambda x: x["price"])
         print(
             f"- {pos}: {b['name']} ({b['team'] if enforce_club else '-'}) £{b['price']:.1f}"
         )
@@ -507,7 +437,7 @@ print(
     f"- Start-Regeln (strikt, mit Notfall-Relax): Nailedness >= {MIN_NAILED_PCT:.2f}, kein GK < £{START_GK_MIN_PRICE:.1f}, max. {MAX_CHEAP_DEF_IN_XI} x £4.0-DEF in der XI."
 )
 print(
-    "- Auswahl = Greedy unter Budget 100.0, Formation 3-5-2, Bank = günstig & möglichst nailed."
+    f"- Auswahl = {'ILP' if USE_ILP else 'Greedy'} unter Budget 100.0, Formation 3-5-2, Bank = günstig & möglichst nailed."
 )
 print(
     "- Klublimit:",
@@ -6,21 +6,35 @@ the outputs. Uses file-based module loading to avoid package import issues.
 """
 
 import argparse
+import functools
 import importlib.util
 import pathlib
+import sys
 from typing import Optional
 
 
-def _load_module(path: pathlib.Path):
-    """Load a module from a file path and return the module object."""
-    spec = importlib.util.spec_from_file_location(path.stem, str(path))
+@functools.lru_cache(maxsize=None)
+def _load_module_cached(path_str: str, mtime: float):
+    """Execute the module file once per (path, mtime) and register it."""
+    path = pathlib.Path(path_str)
+    spec = importlib.util.spec_from_file_location(path.stem, path_str)
     if spec is None or spec.loader is None:
         raise ImportError(f"Cannot load module from {path}")
     mod = importlib.util.module_from_spec(spec)
+    sys.modules[path.stem] = mod
     spec.loader.exec_module(mod)
     return mod
 
 
+def _load_module(path: pathlib.Path):
+    """Load a module from a file path and return the module object.
+
+    Reuses the already executed module unless the file changed on disk.
+    """
+    path = path.resolve()
+    return _load_module_cached(str(path), path.stat().st_mtime)
+
+
 def main(argv: Optional[list] = None):
     parser = argparse.ArgumentParser()
     parser.add_argument("--season", required=True)
@@ -4,21 +4,33 @@ from pprint import pprint
 
 import pandas as pd
 
+import functools
 import importlib.util
 import pathlib
+import sys
 
 
-def _load_def_metrics():
-    """Dynamically load compute_team_def_metrics from the module file."""
-    repo = pathlib.Path(__file__).resolve().parents[1]
-    module_path = repo / "code" / "utils" / "def_metrics.py"
-    spec = importlib.util.spec_from_file_location("def_metrics", str(module_path))
+@functools.lru_cache(maxsize=None)
+def _load_def_metrics_cached(path_str: str, mtime: float):
+    spec = importlib.util.spec_from_file_location("def_metrics", path_str)
     if spec is None:
-        raise ImportError(f"Could not create module spec for {module_path}")
+        raise ImportError(f"Could not create module spec for {path_str}")
     if spec.loader is None:
-        raise ImportError(f"No loader available for module spec from {module_path}")
+        raise ImportError(f"No loader available for module spec from {path_str}")
     mod = importlib.util.module_from_spec(spec)
+    sys.modules["def_metrics"] = mod
     spec.loader.exec_module(mod)
+    return mod
+
+
+def _load_def_metrics():
+    """Dynamically load compute_team_def_metrics from the module file.
+
+    Cached per (path, mtime), so repeated imports do not re-execute the file.
+    """
+    repo = pathlib.Path(__file__).resolve().parents[1]
+    module_path = repo / "code" / "utils" / "def_metrics.py"
+    mod = _load_def_metrics_cached(str(module_path), module_path.stat().st_mtime)
     return mod.compute_team_def_metrics
 
 
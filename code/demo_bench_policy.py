@@ -141,6 +141,7 @@ def print_bench_comparison():
     ]
 
     squad_df = pd.DataFrame(squad_data)
+    by_id = squad_df.set_index("player_id")
 
     print("=" * 70)
     print("BENCH POLICY DEMONSTRATION")
@@ -160,7 +161,7 @@ def print_bench_comparison():
     print(f"Starting XI: {result1['xi_ids']}")
     print("\nBench order (by player_id):")
     for i, pid in enumerate(result1["bench_out_ids"], 1):
-        player = squad_df[squad_df["player_id"] == pid].iloc[0]
+        player = by_id.loc[pid]
         doubtful_flag = "⚠️  DOUBTFUL" if player["doubtful"] else ""
         print(
             f"  {i}. {player['name']} ({player['position']}, {player['pred_points']:.1f} pts) {doubtful_flag}"
@@ -182,7 +183,7 @@ def print_bench_comparison():
     print(f"Starting XI: {result2['xi_ids']}")
     print("\nBench order (by player_id):")
     for i, pid in enumerate(result2["bench_out_ids"], 1):
-        player = squad_df[squad_df["player_id"] == pid].iloc[0]
+        player = by_id.loc[pid]
         doubtful_flag = "⚠️  DOUBTFUL" if player["doubtful"] else ""
         effective_score = player["pred_points"] * (0.75 if player["doubtful"] else 1.0)
         score_note = (
@@ -176,8 +176,9 @@ def demo_full_workflow():
     print(table)
 
     print("\n5. Verification:")
-    captain_name = squad[squad["player_id"] == result["captain_id"]]["name"].values[0]
-    vice_name = squad[squad["player_id"] == result["vice_id"]]["name"].values[0]
+    by_id = squad.set_index("player_id")
+    captain_name = by_id.at[result["captain_id"], "name"]
+    vice_name = by_id.at[result["vice_id"], "name"]
     print(f"   ✓ Captain: {captain_name}")
     print(f"   ✓ Vice-captain: {vice_name}")
     print(f"   ✓ Starting XI: {len(result['xi_ids'])} players")
@@ -185,9 +186,7 @@ def demo_full_workflow():
 
     # Show formation details
     counts = {"GK": 0, "DEF": 0, "MID": 0, "FWD": 0}
-    for pid in result["xi_ids"]:
-        pos = squad[squad["player_id"] == pid]["position"].values[0]
-        counts[pos] += 1
+    counts.update(by_id.loc[result["xi_ids"], "position"].value_counts().to_dict())
     print(f"\n6. Formation Breakdown ({result['formation']}):")
     print(
         f"   GK: {counts['GK']}, DEF: {counts['DEF']}, "
@@ -4,6 +4,9 @@ Error-/Ranking-Analyse (Residuals, Ausreißer, per Position)
 
 Usage (from repo root):
   python code\\error_analysis.py
+  python code\\error_analysis.py --format parquet   # needs pyarrow
+  python code\\error_analysis.py --engine polars    # needs polars
+  python code\\error_analysis.py --no-plots         # tables only
 
 Inputs
 - Picks latest CSV: out/detailed_results_*.csv
@@ -12,65 +15,94 @@ Inputs
     true_points (or total_points), residual (computed if missing)
 
 Outputs (written to out/):
-- error_top20_<stamp>.csv
-- metrics_by_position_<stamp>.csv
+- error_top20_<stamp>.csv|.parquet
+- metrics_by_position_<stamp>.csv|.parquet
 - residuals_plot_<stamp>.png
 - calibration_plot_<stamp>.png
 
-Self-contained: stdlib + pandas + numpy + matplotlib (+ scipy if available)
+Self-contained: stdlib + pandas + numpy + matplotlib (+ numba if available)
+Optional: --engine polars runs read/residual/top-20/metrics as one lazy plan
 """
 
 from __future__ import annotations
 
+import argparse
 import os
 import sys
-import glob
 import datetime as dt
-from typing import Optional, List
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, List, Sequence, Union
 
 import numpy as np
 import pandas as pd
 
-# Use a non-interactive backend to avoid display issues
-import matplotlib
+if TYPE_CHECKING:  # matplotlib is imported lazily, only when plotting
+    from matplotlib.figure import Figure
 
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
+try:
+    import pyarrow as pa  # optional, faster CSV parsing
+except Exception:  # pragma: no cover - optional dependency
+    pa = None
+
+try:
+    import polars as pl  # optional, lazy columnar engine
+except Exception:  # pragma: no cover - optional dependency
+    pl = None
 
 try:
-    from scipy import stats as sp_stats  # optional
+    from numba import njit, prange  # optional
 except Exception:  # pragma: no cover - optional dependency
-    sp_stats = None
+    njit = None
+    prange = range
 
 
 def log(msg: str) -> None:
     print(f"[error_analysis] {msg}")
 
 
+# Assume this file lives in <repo>/code/error_analysis.py; resolved once
+_REPO_ROOT = Path(__file__).resolve().parent.parent
+_OUT_DIR = _REPO_ROOT / "out"
+_RESULTS_PREFIX = "detailed_results_"
+_RESULTS_SUFFIX = ".csv"
+# Shortest name with a non-empty stem between prefix and suffix
+_RESULTS_MIN_LEN = len(_RESULTS_PREFIX) + len(_RESULTS_SUFFIX) + 1
+
+
 def repo_root() -> str:
-    # Assume this file lives in <repo>/code/error_analysis.py
-    here = os.path.abspath(os.path.dirname(__file__))
-    return os.path.abspath(os.path.join(here, os.pardir))
+    return str(_REPO_ROOT)
 
 
 def out_dir_path() -> str:
-    path = os.path.join(repo_root(), "out")
-    os.makedirs(path, exist_ok=True)
-    return path
+    _OUT_DIR.mkdir(parents=True, exist_ok=True)
+    return str(_OUT_DIR)
 
 
 def find_latest_results_file() -> Optional[str]:
-    pattern = os.path.join(out_dir_path(), "detailed_results_*.csv")
-    files = glob.glob(pattern)
-    if not files:
-        return None
-    files.sort(key=lambda p: os.path.getmtime(p), reverse=True)
-    return files[0]
-
-
-def pick_true_col(df: pd.DataFrame) -> str:
-    # Infer the true points column name
-    lower_map = {c.lower(): c for c in df.columns}
+    # One scandir pass; DirEntry.stat() is cached, keep only the running max
+    best: Optional[str] = None
+    best_mtime = -1.0
+    with os.scandir(out_dir_path()) as it:
+        for entry in it:
+            name = entry.name
+            # Plain string checks instead of glob/fnmatch; DirEntry.is_file()
+            # uses the d_type from the directory read, no extra stat
+            if (
+                len(name) >= _RESULTS_MIN_LEN
+                and name.startswith(_RESULTS_PREFIX)
+                and name.endswith(_RESULTS_SUFFIX)
+                and entry.is_file()
+            ):
+                mtime = entry.stat().st_mtime
+                if mtime > best_mtime:
+                    best, best_mtime = entry.path, mtime
+    return best
+
+
+def pick_true_col(columns: Sequence[str]) -> str:
+    # Infer the true points column name from the CSV header
+    lower_map = {c.lower(): c for c in columns}
     for key in ("true_points", "total_points"):
         if key in lower_map:
             return lower_map[key]
@@ -83,6 +115,36 @@ def pick_true_col(df: pd.DataFrame) -> str:
     )
 
 
+def _result_columns(csv_path: str) -> tuple[List[str], str]:
+    # Sniff the header first, so only the columns used downstream get parsed
+    header = list(pd.read_csv(csv_path, nrows=0).columns)
+    for col in ("method", "predicted_points"):
+        if col not in header:
+            raise KeyError(f"Missing required column '{col}' in {csv_path}")
+    true_col = pick_true_col(header)
+    wanted = {
+        "method",
+        "gw",
+        "player_id",
+        "name",
+        "pos",
+        "team",
+        "predicted_points",
+        "true_points",
+        "residual",
+        true_col,
+    }
+    return [c for c in header if c in wanted], true_col
+
+
+def read_results(csv_path: str) -> tuple[pd.DataFrame, str]:
+    usecols, true_col = _result_columns(csv_path)
+    dtype = {c: "category" for c in ("method", "pos", "team") if c in usecols}
+    engine = "pyarrow" if pa is not None else "c"
+    df = pd.read_csv(csv_path, usecols=usecols, dtype=dtype, engine=engine)
+    return df, true_col
+
+
 def ensure_numeric(df: pd.DataFrame, cols: List[str]) -> None:
     for c in cols:
         if c in df.columns:
@@ -94,15 +156,51 @@ def compute_residuals(df: pd.DataFrame, pred_col: str, true_col: str) -> pd.Data
     if "true_points" not in df.columns:
         df["true_points"] = df[true_col]
     ensure_numeric(df, [pred_col, "true_points"])
+    # float32 is ample for means/abs/squares/percentiles and halves the bytes
+    # every later pass reads. The subtraction runs on the float64 inputs and
+    # is rounded once into the float32 buffer (no 16.779999-style noise).
+    pred = df[pred_col].to_numpy(dtype=np.float64)
+    true = df["true_points"].to_numpy(dtype=np.float64)
     if "residual" not in df.columns:
-        df["residual"] = df["true_points"] - df[pred_col]
-    ensure_numeric(df, ["residual"])
+        resid = np.empty(len(df), dtype=np.float32)
+        np.subtract(true, pred, out=resid, casting="same_kind")
+        df["residual"] = resid
+    else:
+        ensure_numeric(df, ["residual"])
+        df["residual"] = df["residual"].astype(np.float32)
+    df[pred_col] = pred.astype(np.float32)
+    df["true_points"] = true.astype(np.float32)
     return df
 
 
+def _top_k_per_group(codes: np.ndarray, values: np.ndarray, k: int) -> np.ndarray:
+    """Row positions of the k largest non-NaN values per group code.
+
+    Same selection and order as ``groupby(...).nlargest(k)`` (ties keep the
+    earlier row), but each group is cut with an O(n) introselect instead of
+    a sort. Groups come out in ascending code order.
+    """
+    valid = np.flatnonzero(~np.isnan(values))
+    # Stable sort by code: rows grouped per method, original order inside
+    order = valid[np.argsort(codes[valid], kind="stable")]
+    bounds = np.flatnonzero(np.diff(codes[order])) + 1
+    picked = []
+    for idx in np.split(order, bounds):
+        vals = values[idx]
+        if idx.size > k:
+            # k-th largest via introselect; ties at the cut keep the earlier rows
+            thr = np.partition(vals, idx.size - k)[idx.size - k]
+            keep = vals > thr
+            keep[np.flatnonzero(vals == thr)[: k - int(keep.sum())]] = True
+            idx, vals = idx[keep], vals[keep]
+        picked.append(idx[np.lexsort((idx, -vals))])
+    return np.concatenate(picked) if picked else np.empty(0, dtype=np.intp)
+
+
 def top20_outliers_by_method(df: pd.DataFrame, pred_col: str) -> pd.DataFrame:
-    df = df.copy()
-    df["abs_residual"] = df["residual"].abs()
+    abs_res = np.abs(df["residual"].to_numpy())
+    # Group order as groupby(sort=True, dropna=False): sorted methods, NaN last
+    codes, _ = pd.factorize(df["method"], sort=True, use_na_sentinel=False)
     keep_cols = [
         c
         for c in [
@@ -115,64 +213,228 @@ def top20_outliers_by_method(df: pd.DataFrame, pred_col: str) -> pd.DataFrame:
             pred_col,
             "true_points",
             "residual",
-            "abs_residual",
         ]
         if c in df.columns
     ]
-    out_list = []
-    for method, g in df.groupby("method", dropna=False):
-        g2 = g.sort_values("abs_residual", ascending=False).head(20)
-        out_list.append(g2[keep_cols])
-    if not out_list:
-        return pd.DataFrame(columns=keep_cols)
-    return pd.concat(out_list, axis=0, ignore_index=True)
-
-
-def group_spearman(x: pd.Series, y: pd.Series) -> float:
-    # Drop NA pairs
-    xy = pd.concat([x, y], axis=1).dropna()
-    if len(xy) < 2:
-        return float("nan")
-    if sp_stats is not None:
-        try:
-            r = sp_stats.spearmanr(
-                xy.iloc[:, 0].values, xy.iloc[:, 1].values, nan_policy="omit"
-            )
-            # scipy returns correlation and pvalue; guard against scalar vs object
-            corr = getattr(r, "correlation", None)
-            return float(corr) if corr is not None else float("nan")
-        except Exception:
-            pass
-    # Fallback to pandas
-    try:
-        return float(xy.iloc[:, 0].corr(xy.iloc[:, 1], method="spearman"))
-    except Exception:
-        return float("nan")
+    top_idx = _top_k_per_group(codes, abs_res, 20)
+    out = df.iloc[top_idx][keep_cols].reset_index(drop=True)
+    out["abs_residual"] = abs_res[top_idx]
+    return out
+
+
+def _avg_ranks(x: np.ndarray) -> np.ndarray:
+    # Average ranks (1-based) like scipy.stats.rankdata(method="average")
+    n = x.size
+    order = np.argsort(x, kind="mergesort")
+    ranks = np.empty(n)
+    i = 0
+    while i < n:
+        j = i
+        while j + 1 < n and x[order[j + 1]] == x[order[i]]:
+            j += 1
+        avg = 0.5 * (i + j) + 1.0
+        for k in range(i, j + 1):
+            ranks[order[k]] = avg
+        i = j + 1
+    return ranks
+
+
+def _group_metrics_kernel(
+    starts: np.ndarray,
+    order: np.ndarray,
+    pred: np.ndarray,
+    true: np.ndarray,
+    res: np.ndarray,
+) -> np.ndarray:
+    # One pass per group: n, MAE, RMSE, Spearman (Pearson of average ranks)
+    ngroups = starts.size - 1
+    out = np.full((ngroups, 4), np.nan)
+    for gi in prange(ngroups):
+        idx = order[starts[gi] : starts[gi + 1]]
+        m = idx.size
+        out[gi, 0] = m
+        if m == 0:
+            continue
+        s_abs = 0.0
+        s_sq = 0.0
+        for i in idx:
+            s_abs += abs(res[i])
+            s_sq += res[i] * res[i]
+        out[gi, 1] = s_abs / m
+        out[gi, 2] = np.sqrt(s_sq / m)
+        if m < 2:
+            continue
+        rp = _avg_ranks(pred[idx])
+        rt = _avg_ranks(true[idx])
+        mp = rp.mean()
+        mt = rt.mean()
+        cov = 0.0
+        vp = 0.0
+        vt = 0.0
+        for k in range(m):
+            dp = rp[k] - mp
+            dt_ = rt[k] - mt
+            cov += dp * dt_
+            vp += dp * dp
+            vt += dt_ * dt_
+        if vp > 0.0 and vt > 0.0:
+            out[gi, 3] = cov / np.sqrt(vp * vt)
+    return out
+
+
+if njit is not None:
+    # No cache=True: the on-disk cache pins the importing module's name, so a
+    # cache written by ``import error_analysis`` breaks a later script run.
+    _avg_ranks = njit(_avg_ranks)
+    _group_metrics_kernel = njit(parallel=True, fastmath=True)(_group_metrics_kernel)
+
+
+def _metrics_numba(g: pd.DataFrame, keys: List[str], pred_col: str) -> pd.DataFrame:
+    codes = g.groupby(keys, dropna=False, sort=False, observed=True).ngroup().to_numpy()
+    order = np.argsort(codes, kind="stable")
+    counts = np.bincount(codes, minlength=int(codes.max()) + 1 if codes.size else 0)
+    starts = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+    out = _group_metrics_kernel(
+        starts,
+        order.astype(np.int64),
+        g[pred_col].to_numpy(dtype=np.float64),
+        g["true_points"].to_numpy(dtype=np.float64),
+        g["residual"].to_numpy(dtype=np.float64),
+    )
+    agg = g[keys].drop_duplicates().reset_index(drop=True)
+    agg["n"] = out[:, 0].astype(int)
+    agg["MAE"] = out[:, 1]
+    agg["RMSE"] = out[:, 2]
+    agg["Spearman"] = out[:, 3]
+    return agg
+
+
+def _metrics_pandas(g: pd.DataFrame, keys: List[str], pred_col: str) -> pd.DataFrame:
+    by = g.groupby(keys, dropna=False, sort=False, observed=True)
+    res = g["residual"].to_numpy(dtype=float)
+    # Spearman = Pearson der Ränge innerhalb jeder (method, pos)-Gruppe
+    # Beide Spalten in einem groupby-rank-Durchlauf ranken
+    ranks = by[[pred_col, "true_points"]].rank(method="average")
+    rp = ranks[pred_col].to_numpy(dtype=float)
+    rt = ranks["true_points"].to_numpy(dtype=float)
+    work = g[keys].assign(
+        _abs=np.abs(res),
+        _sq=res * res,
+        _rp=rp,
+        _rt=rt,
+        _rpt=rp * rt,
+        _rp2=rp * rp,
+        _rt2=rt * rt,
+    )
+    agg = work.groupby(keys, dropna=False, sort=False, observed=True).agg(
+        n=("_abs", "size"),
+        MAE=("_abs", "mean"),
+        _ms=("_sq", "mean"),
+        _rp=("_rp", "mean"),
+        _rt=("_rt", "mean"),
+        _rpt=("_rpt", "mean"),
+        _rp2=("_rp2", "mean"),
+        _rt2=("_rt2", "mean"),
+    )
+    cov = agg["_rpt"] - agg["_rp"] * agg["_rt"]
+    var = (agg["_rp2"] - agg["_rp"] ** 2) * (agg["_rt2"] - agg["_rt"] ** 2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        spearman = cov / np.sqrt(var)
+    agg["RMSE"] = np.sqrt(agg["_ms"])
+    agg["Spearman"] = spearman.where((agg["n"] >= 2) & (var > 1e-12))
+    return agg[["n", "MAE", "RMSE", "Spearman"]].reset_index()
 
 
 def metrics_by_position(df: pd.DataFrame, pred_col: str) -> pd.DataFrame:
-    rows = []
-    for (method, pos), g in df.groupby(["method", "pos"], dropna=False):
-        g = g[[pred_col, "true_points", "residual"]].dropna()
-        n = len(g)
-        if n == 0:
-            mae = rmse = spearman = float("nan")
-        else:
-            res = g["residual"].to_numpy(dtype=float)
-            mae = float(np.mean(np.abs(res)))
-            rmse = float(np.sqrt(np.mean(np.square(res))))
-            spearman = group_spearman(g[pred_col], g["true_points"])
-        rows.append(
-            {
-                "method": method,
-                "pos": pos,
-                "n": n,
-                "MAE": mae,
-                "RMSE": rmse,
-                "Spearman": spearman,
-            }
+    keys = ["method", "pos"]
+    cols = [pred_col, "true_points", "residual"]
+    groups = df[keys].drop_duplicates()
+    g = df.loc[df[cols].notna().all(axis=1), keys + cols]
+    if njit is not None:
+        agg = _metrics_numba(g, keys, pred_col)
+    else:
+        agg = _metrics_pandas(g, keys, pred_col)
+    out = groups.merge(agg, on=keys, how="left")
+    out["n"] = out["n"].fillna(0).astype(int)
+    return out.sort_values(keys).reset_index(drop=True)
+
+
+def analyze_polars(
+    csv_path: str, pred_col: str
+) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """Residuals, top-20 and per-position metrics as one lazy Polars plan.
+
+    Returns (plot frame, top-20 table, metrics table) as pandas frames with the
+    same columns as the pandas path; the plot frame only carries the columns
+    the figures need.
+    """
+    usecols, true_col = _result_columns(csv_path)
+    keys = ["method", "pos"]
+
+    def num(c: str) -> "pl.Expr":
+        return pl.col(c).cast(pl.Float64, strict=False).fill_nan(None)
+
+    lf = pl.scan_csv(csv_path).select(usecols)
+    if "true_points" not in usecols:
+        lf = lf.with_columns(pl.col(true_col).alias("true_points"))
+    lf = lf.with_columns(num(pred_col), num("true_points"))
+    if "residual" in usecols:
+        lf = lf.with_columns(num("residual"))
+    else:
+        lf = lf.with_columns(
+            (pl.col("true_points") - pl.col(pred_col)).alias("residual")
+        )
+    if "pos" not in usecols:
+        log("Column 'pos' missing; synthesizing single 'ALL' position.")
+        lf = lf.with_columns(pl.lit("ALL").alias("pos"))
+    lf = lf.with_columns(pl.col(keys).cast(pl.Utf8))
+
+    keep_cols = [
+        c
+        for c in ["method", "gw", "player_id", "name", "pos", "team"]
+        if c in usecols or c == "pos"
+    ] + [pred_col, "true_points", "residual"]
+    top_lf = (
+        lf.filter(pl.col("residual").is_not_null())
+        .with_columns(pl.col("residual").abs().alias("abs_residual"))
+        .sort("abs_residual", descending=True, maintain_order=True)
+        .group_by("method", maintain_order=True)
+        .head(20)
+        .sort("method", maintain_order=True)
+        .select(keep_cols + ["abs_residual"])
+    )
+
+    # Spearman = Pearson der Ränge innerhalb jeder (method, pos)-Gruppe
+    agg_lf = (
+        lf.drop_nulls([pred_col, "true_points", "residual"])
+        .group_by(keys)
+        .agg(
+            pl.len().alias("n"),
+            pl.col("residual").abs().mean().alias("MAE"),
+            (pl.col("residual") ** 2).mean().sqrt().alias("RMSE"),
+            pl.corr(
+                pl.col(pred_col).rank("average"),
+                pl.col("true_points").rank("average"),
+            ).alias("Spearman"),
         )
-    return pd.DataFrame(rows).sort_values(["method", "pos"]).reset_index(drop=True)
+    )
+    metrics_lf = (
+        lf.select(keys)
+        .unique()
+        .join(agg_lf, on=keys, how="left")
+        .with_columns(pl.col("n").fill_null(0).cast(pl.Int64))
+        .sort(keys)
+    )
+    plot_lf = lf.select(["method", pred_col, "true_points", "residual"])
+
+    # One collect: the scan and the shared prefix of the plans run once
+    plot_pl, top_pl, metrics_pl = pl.collect_all([plot_lf, top_lf, metrics_lf])
+
+    def to_pandas(frame: "pl.DataFrame") -> pd.DataFrame:
+        # Column-wise numpy hand-off; avoids requiring pyarrow for to_pandas()
+        return pd.DataFrame({c: frame[c].to_numpy() for c in frame.columns})
+
+    return to_pandas(plot_pl), to_pandas(top_pl), to_pandas(metrics_pl)
 
 
 def select_methods_for_plots(df: pd.DataFrame, max_methods: int = 3) -> List[str]:
@@ -181,73 +443,92 @@ def select_methods_for_plots(df: pd.DataFrame, max_methods: int = 3) -> List[str
     return [str(m) for m in selected]
 
 
+def _pct(a: np.ndarray, p: Sequence[float]) -> np.ndarray:
+    # Order statistics via introselect (O(N)) instead of a full sort; lower rank
+    a = a[~np.isnan(a)]
+    k = (np.asarray(p, dtype=float) * 0.01 * (a.size - 1)).astype(np.int64)
+    return np.partition(a, k)[k]
+
+
+def new_figure() -> Figure:
+    # Figure + Agg canvas directly: no pyplot state machine, no display backend
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    return fig
+
+
 def plot_residuals(
-    df: pd.DataFrame, pred_col: str, methods: List[str], out_path: str
+    df: pd.DataFrame,
+    pred_col: str,
+    methods: List[str],
+    out_path: Union[str, Path],
 ) -> None:
     if not methods:
         log("No methods to plot for residuals.")
         return
     ncols = len(methods)
-    fig, axes = plt.subplots(1, ncols, figsize=(5 * ncols, 4), squeeze=False)
-    axes = axes[0]
+    fig = new_figure()
+    fig.set_size_inches(5 * ncols, 4)
+    axes = fig.subplots(1, ncols, squeeze=False)[0]
     for ax, method in zip(axes, methods):
         g = df[df["method"].astype(str) == method]
         g = g[[pred_col, "residual"]].dropna()
-        if len(g) > 5000:
-            # subsample to keep the figure lightweight
-            g = g.sample(5000, random_state=42)
-        ax.scatter(g[pred_col], g["residual"], s=10, alpha=0.35)
+        pred = g[pred_col].to_numpy(dtype=float)
+        resid = g["residual"].to_numpy(dtype=float)
+        # All points, rasterized: Agg blends them into the canvas in one pass,
+        # so no subsample is needed and outliers stay visible
+        ax.scatter(pred, resid, s=4, alpha=0.15, rasterized=True, linewidths=0)
         ax.axhline(0.0, color="black", lw=1, ls="--")
-        ax.set_title(f"Residuals: {method} (n={len(g)})")
+        ax.set_title(f"Residuals: {method} (n={len(pred)})")
         ax.set_xlabel("predicted_points")
         ax.set_ylabel("residual (true - pred)")
         # Helpful range guards
         try:
-            x_min, x_max = np.nanpercentile(g[pred_col], [1, 99])
-            y_min, y_max = np.nanpercentile(g["residual"], [1, 99])
+            x_min, x_max = _pct(pred, [1, 99])
+            y_min, y_max = _pct(resid, [1, 99])
             ax.set_xlim(x_min - 0.5, x_max + 0.5)
             ax.set_ylim(y_min - 0.5, y_max + 0.5)
         except Exception:
             pass
     fig.tight_layout()
     fig.savefig(out_path, dpi=150)
-    plt.close(fig)
 
 
 def plot_calibration(
-    df: pd.DataFrame, pred_col: str, methods: List[str], out_path: str
+    df: pd.DataFrame,
+    pred_col: str,
+    methods: List[str],
+    out_path: Union[str, Path],
 ) -> None:
     if not methods:
         log("No methods to plot for calibration.")
         return
-    fig, ax = plt.subplots(1, 1, figsize=(6, 5))
+    fig = new_figure()
+    fig.set_size_inches(6, 5)
+    ax = fig.add_subplot(1, 1, 1)
     for method in methods:
         g = df[df["method"].astype(str) == method][[pred_col, "true_points"]].dropna()
         if len(g) < 2:
             continue
-        try:
-            # Bin by predicted into deciles within each method
-            g = g.copy()
-            g["bin"] = pd.qcut(g[pred_col], q=10, labels=False, duplicates="drop")
-            agg = (
-                g.groupby("bin", dropna=True)
-                .agg(
-                    mean_pred=(pred_col, "mean"),
-                    mean_true=("true_points", "mean"),
-                    count=(pred_col, "size"),
-                )
-                .dropna()
-            )
-            ax.plot(
-                agg["mean_pred"],
-                agg["mean_true"],
-                marker="o",
-                lw=1.5,
-                label=f"{method} (n={agg['count'].sum()})",
-            )
-        except Exception:
-            # If qcut fails due to not enough unique values
-            continue
+        # Deciles: sort once, split into 10 equal-count slices, mean per slice
+        pred = g[pred_col].to_numpy(dtype=float)
+        true = g["true_points"].to_numpy(dtype=float)
+        order = np.argsort(pred, kind="quicksort")
+        n = len(order)
+        edges = np.linspace(0, n, min(10, n) + 1).astype(np.int64)
+        counts = np.diff(edges)
+        mean_pred = np.add.reduceat(pred[order], edges[:-1]) / counts
+        mean_true = np.add.reduceat(true[order], edges[:-1]) / counts
+        ax.plot(
+            mean_pred,
+            mean_true,
+            marker="o",
+            lw=1.5,
+            label=f"{method} (n={n})",
+        )
     # Perfect calibration guide
     all_vals = df[[pred_col, "true_points"]].dropna()
     if len(all_vals) > 0:
@@ -266,12 +547,55 @@ def plot_calibration(
     ax.legend(loc="best", fontsize=8)
     fig.tight_layout()
     fig.savefig(out_path, dpi=150)
-    plt.close(fig)
+
+
+def write_table(df: pd.DataFrame, stem: str, fmt: str) -> Path:
+    # Parquet: columnar + zstd, category columns (method/pos) are dict-encoded
+    if fmt == "parquet":
+        path = _OUT_DIR / f"{stem}.parquet"
+        df.to_parquet(path, engine="pyarrow", compression="zstd", index=False)
+    else:
+        path = _OUT_DIR / f"{stem}.csv"
+        df.to_csv(path, index=False)
+    return path
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Residual/outlier/per-position analysis of detailed_results_*.csv"
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["pandas", "polars"],
+        default="pandas",
+        help="Dataframe engine for reading and the tables (default: pandas)",
+    )
+    parser.add_argument(
+        "--no-plots",
+        action="store_true",
+        help="Only write the tables; skip the plots (and the matplotlib import)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["csv", "parquet"],
+        default="csv",
+        help="Output format for the top-20 and metrics tables (default: csv)",
+    )
+    return parser.parse_args(argv)
 
 
 def main(argv: List[str]) -> int:
+    args = parse_args(argv)
+    fmt = args.format
+    if fmt == "parquet" and pa is None:
+        log("pyarrow not installed; writing CSV instead of Parquet.")
+        fmt = "csv"
+    engine = args.engine
+    if engine == "polars" and pl is None:
+        log("polars not installed; using the pandas engine.")
+        engine = "pandas"
     stamp = dt.datetime.now().strftime("%Y%m%d_%H%M%S")
-    out_dir = out_dir_path()
+    out_dir_path()
 
     csv_path = find_latest_results_file()
     if not csv_path or not os.path.exists(csv_path):
@@ -279,54 +603,62 @@ def main(argv: List[str]) -> int:
         return 1
     log(f"Using input: {csv_path}")
 
-    df = pd.read_csv(csv_path)
-    # Basic required columns check
-    required = ["method", "predicted_points"]
-    for col in required:
-        if col not in df.columns:
-            raise KeyError(f"Missing required column '{col}' in {csv_path}")
+    if engine == "polars":
+        df, top20_df, metrics_df = analyze_polars(csv_path, pred_col="predicted_points")
+    else:
+        # Reads only the needed columns (required columns are checked on the header)
+        df, true_col = read_results(csv_path)
 
-    # Robustly pick true column and compute residual if needed
-    true_col = pick_true_col(df)
-    df = compute_residuals(df, pred_col="predicted_points", true_col=true_col)
+        # Compute residual if needed
+        df = compute_residuals(df, pred_col="predicted_points", true_col=true_col)
+
+        # Top-20 outliers per method
+        top20_df = top20_outliers_by_method(df, pred_col="predicted_points")
+
+        # Per-position metrics (MAE, RMSE, Spearman)
+        if "pos" not in df.columns:
+            log("Column 'pos' missing; synthesizing single 'ALL' position.")
+            df["pos"] = "ALL"
+        metrics_df = metrics_by_position(df, pred_col="predicted_points")
 
     # Log basic counts
     n_rows = len(df)
     n_methods = df["method"].nunique(dropna=False)
     log(f"Rows: {n_rows:,} | Methods: {n_methods}")
 
-    # 1) Top-20 outliers per method
-    top20_df = top20_outliers_by_method(df, pred_col="predicted_points")
-    top20_path = os.path.join(out_dir, f"error_top20_{stamp}.csv")
-    top20_df.to_csv(top20_path, index=False)
-    log(f"Wrote top-20 outliers per method: {top20_path} (rows={len(top20_df)})")
-
-    # 2) Per-position metrics (MAE, RMSE, Spearman)
-    if "pos" not in df.columns:
-        log("Column 'pos' missing; synthesizing single 'ALL' position.")
-        df["pos"] = "ALL"
-    metrics_df = metrics_by_position(df, pred_col="predicted_points")
-    metrics_path = os.path.join(out_dir, f"metrics_by_position_{stamp}.csv")
-    metrics_df.to_csv(metrics_path, index=False)
-    log(f"Wrote per-position metrics: {metrics_path} (rows={len(metrics_df)})")
-
-    # Choose up to 3 methods for plotting to keep figures readable
-    sel_methods = select_methods_for_plots(df, max_methods=3)
-    log(f"Plotting methods: {sel_methods}")
-
-    # 3) Residuals plot
-    resid_plot_path = os.path.join(out_dir, f"residuals_plot_{stamp}.png")
-    plot_residuals(
-        df, pred_col="predicted_points", methods=sel_methods, out_path=resid_plot_path
-    )
-    log(f"Wrote residuals plot: {resid_plot_path}")
+    # Table writes and plot renders are independent: run them side by side
+    # (CSV encode and Agg rendering release the GIL; each plot has its own Figure)
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        # 1) Top-20 outliers per method
+        f_top20 = ex.submit(write_table, top20_df, f"error_top20_{stamp}", fmt)
+        # 2) Per-position metrics (MAE, RMSE, Spearman)
+        f_metrics = ex.submit(
+            write_table, metrics_df, f"metrics_by_position_{stamp}", fmt
+        )
 
-    # 4) Calibration plot (deciles)
-    calib_plot_path = os.path.join(out_dir, f"calibration_plot_{stamp}.png")
-    plot_calibration(
-        df, pred_col="predicted_points", methods=sel_methods, out_path=calib_plot_path
-    )
-    log(f"Wrote calibration plot: {calib_plot_path}")
+        plot_jobs = []
+        if not args.no_plots:
+            # Choose up to 3 methods for plotting to keep figures readable
+            sel_methods = select_methods_for_plots(df, max_methods=3)
+            log(f"Plotting methods: {sel_methods}")
+            # 3) Residuals plot, 4) Calibration plot (deciles)
+            for label, plot_fn, stem in (
+                ("residuals", plot_residuals, "residuals_plot"),
+                ("calibration", plot_calibration, "calibration_plot"),
+            ):
+                path = _OUT_DIR / f"{stem}_{stamp}.png"
+                job = ex.submit(plot_fn, df, "predicted_points", sel_methods, path)
+                plot_jobs.append((label, path, job))
+
+        top20_path = f_top20.result()
+        log(f"Wrote top-20 outliers per method: {top20_path} (rows={len(top20_df)})")
+        metrics_path = f_metrics.result()
+        log(f"Wrote per-position metrics: {metrics_path} (rows={len(metrics_df)})")
+        if args.no_plots:
+            log("Skipping plots (--no-plots).")
+        for label, path, job in plot_jobs:
+            job.result()
+            log(f"Wrote {label} plot: {path}")
 
     log("Done.")
     return 0
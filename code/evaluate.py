@@ -5,6 +5,7 @@ from __future__ import (
 )  # Erlaubt moderne Typ-Features auch auf aelteren Python-Versionen
 
 import argparse  # Zum Einlesen der Kommandozeilenargumente
+from concurrent.futures import ThreadPoolExecutor  # Spieltage parallel auswerten
 import logging  # Fuer einheitliche Log-Ausgaben
 import sys  # Ermoeglicht das Anpassen des Python-Suchpfads
 from pathlib import Path  # Pfadobjekte statt einfacher Strings
@@ -15,6 +16,11 @@ import pandas as pd  # Tabellendaten bequem bearbeiten
 import os  # Betriebssystemfunktionen (Pfadmanipulation etc.)
 import importlib.util  # Hilfsfunktionen zum dynamischen Laden von Modulen
 
+try:
+    from numba import njit  # Optional: JIT fuer die MAE-Aggregation
+except Exception:  # pragma: no cover - optionale Abhaengigkeit
+    njit = None
+
 # Sicherstellen, dass das Projektwurzelverzeichnis im Suchpfad liegt, egal von wo das Skript gestartet wird
 PROJECT_ROOT = (
     Path(__file__).resolve().parents[1]
@@ -56,8 +62,21 @@ add_team_baseline_b1_score = _baselines.add_team_baseline_b1_score
 add_team_baseline_b2_score = _baselines.add_team_baseline_b2_score
 
 ALLOWED_FORMATIONS = _team_builder.ALLOWED_FORMATIONS
-build_team = _team_builder.build_team
-choose_best_formation = _team_builder.choose_best_formation
+build_teams = _team_builder.build_teams
+choose_best_formations = _team_builder.choose_best_formations
+
+# Optional model adapter: resolved once here instead of re-executing
+# rf_baseline.py on every gameweek
+try:
+    _rf_mod = _import_local("rf_baseline", "code/rf_baseline.py")
+    _rf_predict_for = getattr(_rf_mod, "predict_for")
+    _rf_train_until = getattr(_rf_mod, "train_rf_until")
+    _HAVE_RF = True
+    _RF_UNAVAILABLE: Optional[str] = None
+except Exception as _rf_exc:  # Adapter fehlt oder ist unvollstaendig
+    _rf_predict_for = _rf_train_until = None
+    _HAVE_RF = False
+    _RF_UNAVAILABLE = str(_rf_exc)
 # --- end robust imports ---
 
 
@@ -86,48 +105,74 @@ def parse_args() -> argparse.Namespace:  # Kapselt die CLI-Argumente
     parser.add_argument(
         "--dry_run", action="store_true"
     )  # Optionaler Trockenlauf ohne Dateien zu schreiben
+    parser.add_argument(
+        "--workers", type=int, default=0
+    )  # Parallele Spieltage (0 = automatisch, 1 = seriell)
     return parser.parse_args()  # Rueckgabe der geparsten Argumente
 
 
-def mae(
-    y_true: np.ndarray, y_pred: np.ndarray
-) -> float:  # Mittlerer absoluter Fehler berechnen
-    true_arr = np.asarray(
-        y_true, dtype=float
-    )  # Wahrheitswerte in Float-Array umwandeln
-    pred_arr = np.asarray(y_pred, dtype=float)  # Prognosewerte in Float-Array umwandeln
-    mask = ~np.isnan(true_arr) & ~np.isnan(
-        pred_arr
-    )  # Nur Paare ohne Fehlwerte behalten
-    if mask.sum() == 0:  # Falls keine gueltigen Paare existieren
-        return float("nan")  # Rueckgabe von NaN als Platzhalter
-    return float(
-        np.mean(np.abs(true_arr[mask] - pred_arr[mask]))
-    )  # Durchschnitt der absoluten Abweichungen berechnen
+ModelCache = Dict[Tuple[str, int, int], object]  # (Saison, letzter Train-GW, Seed)
+
+
+MAE_VARIANTS = [  # Modell sowie A1 und A2 (Label, Prognosespalte)
+    ("model", "model_points_pred"),
+    ("A1", "baseline_a1_points"),
+    ("A2", "baseline_a2_points"),
+]
+
+
+def _group_abs_err_sums(
+    codes: np.ndarray, err: np.ndarray, n_groups: int
+) -> Tuple[np.ndarray, np.ndarray]:  # Summe und Anzahl gueltiger Fehler je Gruppe
+    sums = np.zeros((n_groups, err.shape[1]))  # Fehlersummen (Gruppen x Varianten)
+    counts = np.zeros((n_groups, err.shape[1]), dtype=np.int64)  # Gueltige Paare
+    for i in range(err.shape[0]):  # Ein Durchlauf ueber alle Zeilen
+        c = codes[i]
+        if c < 0:  # Zeile ohne Position: nur im Gesamtwert
+            c = n_groups - 1
+        for j in range(err.shape[1]):
+            v = err[i, j]
+            if not np.isnan(v):  # Fehlwerte ignorieren (Paare mit NaN)
+                sums[c, j] += v
+                counts[c, j] += 1
+    return sums, counts
+
+
+if njit is not None:  # Einmal pro Prozess kompilieren, fuer alle Spieltage nutzen
+    _group_abs_err_sums = njit(nogil=True)(_group_abs_err_sums)
 
 
 def try_model_predict(  # Versucht optionales Modell aus rf_baseline zu verwenden
-    train: pd.DataFrame, test: pd.DataFrame, season: str, random_state: int
+    train: pd.DataFrame,
+    test: pd.DataFrame,
+    season: str,
+    random_state: int,
+    model_cache: Optional[ModelCache] = None,
 ) -> pd.Series:
     """Versucht Vorhersagen eines vorhandenen Random-Forest-Modells zu nutzen."""  # Kurze Funktionsbeschreibung fuer Laien
 
+    if not _HAVE_RF:  # Adapter wurde beim Import nicht gefunden
+        logging.info(
+            "Kein Modell-Adapter nutzbar: %s", _RF_UNAVAILABLE
+        )  # Hinweis im Log fuer Transparenz
+        return pd.Series(
+            np.nan, index=test.index, dtype=float
+        )  # Serie voller NaN als Fallback
+
     try:
-        # Dynamically import the local adapter module using the project's helper to avoid
-        # static resolution of the "code." package name in different environments.
-        rf_mod = _import_local(
-            "rf_baseline", "code/rf_baseline.py"
-        )  # Optionalen Adapter importieren
-        predict_for = getattr(rf_mod, "predict_for")
-        train_rf_until = getattr(rf_mod, "train_rf_until")
-
-        model = train_rf_until(
-            train, season=season, random_state=random_state
-        )  # Modell bis zum Zielspieltag trainieren
-        preds = predict_for(model, test)  # Vorhersagen fuer Testspieler erzeugen
+        key = (season, int(train["gw"].max()), random_state)  # Trainings-Cutoff
+        model = model_cache.get(key) if model_cache is not None else None
+        if model is None:  # Pro Cutoff hoechstens einmal trainieren
+            model = _rf_train_until(
+                train, season=season, random_state=random_state
+            )  # Modell bis zum Zielspieltag trainieren
+            if model_cache is not None:
+                model_cache[key] = model  # Fuer spaetere Aufrufe merken
+        preds = _rf_predict_for(model, test)  # Vorhersagen fuer Testspieler erzeugen
         return pd.Series(
             preds, index=test.index, dtype=float
         )  # Rueckgabe als Serie mit urspruenglichem Index
-    except Exception as exc:  # Falls Import oder Aufruf scheitert
+    except Exception as exc:  # Falls Training oder Vorhersage scheitert
         logging.info(
             "Kein Modell-Adapter nutzbar: %s", exc
         )  # Hinweis im Log fuer Transparenz
@@ -142,12 +187,20 @@ def _evaluate_gw(  # Hilfsroutine fuer einzelne Spieltage
     gw: int,
     formation_mode: str,
     random_state: int,
-) -> Optional[Tuple[pd.DataFrame, Dict[str, float]]]:
+    model_cache: Optional[ModelCache] = None,
+    gw_values: Optional[np.ndarray] = None,
+) -> Optional[Tuple[Tuple[List[object], np.ndarray], Dict[str, float]]]:
     logging.info(
         "Pruefe Spieltag %s", gw
     )  # Infoausgabe welcher Spieltag behandelt wird
-    train = df[df["gw"] < gw].copy()  # Trainingsdaten bis zum Vortag
-    test = df[df["gw"] == gw].copy()  # Testdaten exakt fuer den Spieltag
+    if gw_values is not None:  # df ist nach gw sortiert: Bereiche per Binaersuche
+        lo = int(np.searchsorted(gw_values, gw, side="left"))  # Erster Test-Index
+        hi = int(np.searchsorted(gw_values, gw, side="right"))  # Ende des Spieltags
+        train = df.iloc[:lo]  # Trainingsdaten bis zum Vortag
+        test = df.iloc[lo:hi]  # Testdaten exakt fuer den Spieltag
+    else:
+        train = df[df["gw"] < gw]  # Trainingsdaten bis zum Vortag
+        test = df[df["gw"] == gw]  # Testdaten exakt fuer den Spieltag
     if train.empty or test.empty:  # Falls Daten fehlen
         logging.warning(
             "Train oder Test leer - ueberspringe Spieltag %s", gw
@@ -162,7 +215,11 @@ def _evaluate_gw(  # Hilfsroutine fuer einzelne Spieltage
     test = add_baseline_a1_points(train, test)  # Baseline A1 berechnen und anreichern
     test = add_baseline_a2_points(train, test)  # Baseline A2 berechnen und anreichern
     model_pred = try_model_predict(
-        train, test, season=season, random_state=random_state
+        train,
+        test,
+        season=season,
+        random_state=random_state,
+        model_cache=model_cache,
     )  # Optionales Modell ausfuehren
     if model_pred.isna().all():  # Falls keine gueltigen Modellwerte vorhanden
         logging.info(
@@ -171,65 +228,66 @@ def _evaluate_gw(  # Hilfsroutine fuer einzelne Spieltage
         model_pred = test["baseline_a1_points"].fillna(
             0.0
         )  # Baseline A1 als Ersatzvorhersage
-    test["model_points_pred"] = (
-        model_pred.values
+    test = test.assign(
+        model_points_pred=model_pred.values
     )  # Prognose im Test-DataFrame speichern
 
-    rows_player: List[Dict[str, object]] = []  # Liste fuer MAE-Ergebnisse je Variante
-    for label, column in [  # Fuer Modell sowie A1 und A2
-        ("model", "model_points_pred"),
-        ("A1", "baseline_a1_points"),
-        ("A2", "baseline_a2_points"),
-    ]:
-        rows_player.append(  # Gesamtergebnis fuer alle Positionen erfassen
-            {
-                "season": season,  # Saison hinterlegen
-                "gw": gw,  # Spieltag hinterlegen
-                "who": label,  # Name der Variante
-                "position": "ALL",  # Kennzeichnung fuer Gesamtwert
-                "mae": mae(
-                    test["points"].values, test[column].values
-                ),  # MAE fuer alle Spieler
-            }  # Ende des Dictionary-Eintrags
-        )  # Ende des append-Aufrufs
-        if "position" in test.columns:  # Falls Positionsinfo vorhanden ist
-            for pos, sub in test.groupby("position"):  # Ueber jede Position iterieren
-                rows_player.append(
-                    {
-                        "season": season,  # Saison im Ergebnis belassen
-                        "gw": gw,  # Spieltag speichern
-                        "who": label,  # Variante speichern
-                        "position": pos,  # Konkrete Position
-                        "mae": mae(
-                            sub["points"].values, sub[column].values
-                        ),  # MAE fuer die Position
-                    }  # Abschluss des Blockes
-                )  # Abschluss der Positionsschleife
-
-    cand = test.copy()  # Kandidatenliste fuer Teamauswahl aufbauen
-    cand = add_team_baseline_b1_score(cand, train)  # Team-Baseline B1 berechnen
+    err = np.abs(  # Absolute Fehler als Matrix (Zeilen x Varianten)
+        test[[column for _, column in MAE_VARIANTS]].to_numpy(dtype=float)
+        - test["points"].to_numpy(dtype=float)[:, None]
+    )
+    if "position" in test.columns:  # Positionscodes in groupby-Reihenfolge
+        codes, positions = pd.factorize(test["position"], sort=True)
+    else:
+        codes, positions = np.full(len(test), -1), pd.Index([])
+    n_groups = len(positions) + 1  # Letzte Gruppe sammelt Zeilen ohne Position
+    if njit is not None:  # Ein JIT-Durchlauf fuer alle Positionen und Varianten
+        sums, counts = _group_abs_err_sums(
+            codes.astype(np.int64), np.ascontiguousarray(err), n_groups
+        )
+    else:  # NumPy: bincount je Variante
+        bins = np.where(codes < 0, n_groups - 1, codes)
+        valid = ~np.isnan(err)
+        sums = np.column_stack(
+            [
+                np.bincount(bins, np.where(valid[:, j], err[:, j], 0.0), n_groups)
+                for j in range(err.shape[1])
+            ]
+        ).reshape(n_groups, err.shape[1])
+        counts = np.column_stack(
+            [np.bincount(bins, valid[:, j], n_groups) for j in range(err.shape[1])]
+        ).reshape(n_groups, err.shape[1])
+    sums = np.vstack([sums.sum(axis=0), sums[:-1]])  # Zeile 0 = ALL, dann Positionen
+    counts = np.vstack([counts.sum(axis=0), counts[:-1]])
+    mae_values = np.divide(  # MAE je Zeile, NaN falls keine gueltigen Paare
+        sums, counts, out=np.full(sums.shape, np.nan), where=counts > 0
+    )
+    mae_block = (["ALL", *positions], mae_values)  # Zeilen: ALL, dann Positionen
+
+    cand = add_team_baseline_b1_score(test, train)  # Team-Baseline B1 (neue Tabelle)
     cand = add_team_baseline_b2_score(cand, train)  # Team-Baseline B2 berechnen
 
-    def _select_team(
-        score_col: str, allowed_formations: List[str]
-    ) -> Tuple[str, Dict]:  # Hilfsfunktion fuer Teamwahl
-        frame = cand.assign(
-            pred_points=cand[score_col].fillna(0.0)
-        )  # Zielspalte als Prognosepunkte setzen
+    team_cols = [  # Scorespalten fuer Modell, B1 und B2
+        "model_points_pred",
+        "team_b1_score",
+        "team_b2_score",
+    ]
+    frame = cand.assign(  # Fehlende Scores wie bisher als 0 behandeln
+        **{col: cand[col].fillna(0.0) for col in team_cols}
+    )
+    try:  # Alle drei Teams mit einer gemeinsamen Sortierung bauen
         if formation_mode == "auto":  # Wenn Auto-Modus aktiv ist
-            return choose_best_formation(
-                frame, allowed_formations
-            )  # Beste Formation suchen
-        return formation_mode, build_team(
-            frame, formation=formation_mode
-        )  # Sonst feste Formation nutzen
-
-    try:
-        best_form, model_team = _select_team(
-            "model_points_pred", ALLOWED_FORMATIONS
-        )  # Modell-Team bestimmen
+            selected = choose_best_formations(
+                frame, team_cols, ALLOWED_FORMATIONS
+            )  # Beste Formation je Scorespalte suchen
+        else:  # Sonst feste Formation nutzen
+            selected = [
+                (formation_mode, team)
+                for team in build_teams(frame, team_cols, formation=formation_mode)
+            ]
+        (best_form, model_team), (_, team_b1), (_, team_b2) = selected
     except Exception as exc:  # Falls Teambau scheitert
-        logging.warning("Konnte Modell-Team nicht bauen: %s", exc)  # Warnung ausgeben
+        logging.warning("Konnte Teams nicht bauen: %s", exc)  # Warnung ausgeben
         best_form = (
             formation_mode if formation_mode != "auto" else ALLOWED_FORMATIONS[0]
         )  # Ersatzformation definieren
@@ -239,23 +297,12 @@ def _evaluate_gw(  # Hilfsroutine fuer einzelne Spieltage
             "vice_captain": None,
             "bench": [],
         }  # Leeres Team als Fallback
-
-    try:
-        _, team_b1 = _select_team(
-            "team_b1_score", ALLOWED_FORMATIONS
-        )  # Team fuer Baseline B1 bauen
-    except Exception as exc:  # Fehlerfall auffangen
-        logging.warning("Konnte B1-Team nicht bauen: %s", exc)  # Warnhinweis schreiben
         team_b1 = {"start_xi": [], "captain": None}  # Leeres Team als Ersatz
-
-    try:
-        _, team_b2 = _select_team(
-            "team_b2_score", ALLOWED_FORMATIONS
-        )  # Team fuer Baseline B2 bauen
-    except Exception as exc:  # Fehlerfall auffangen
-        logging.warning("Konnte B2-Team nicht bauen: %s", exc)  # Warnhinweis schreiben
         team_b2 = {"start_xi": [], "captain": None}  # Leeres Team als Ersatz
 
+    test_ids = test["player_id"].to_numpy()  # Spieler-IDs einmal als Array
+    test_pts = test["points"].to_numpy(dtype=float)  # Tatsachenpunkte einmal als Array
+
     def team_real_points(
         team_dict: Dict,
     ) -> float:  # Reale Punkte fuer ein Team berechnen
@@ -268,16 +315,11 @@ def _evaluate_gw(  # Hilfsroutine fuer einzelne Spieltage
         captain_id = team_dict.get("captain", {}).get(
             "player_id"
         )  # Kapitaens-ID auslesen
-        result = 0.0  # Akkumulator fuer Gesamtpunkte
-        for _, row in test[
-            test["player_id"].isin(start_ids)
-        ].iterrows():  # Nur Spieler der Startelf betrachten
-            pts = float(row.get("points", 0.0))  # Tatsachenpunkte des Spielers
-            if (
-                captain_id is not None and row.get("player_id") == captain_id
-            ):  # Kapitaen zaehlt doppelt
-                pts *= 2  # Punkte verdoppeln
-            result += pts  # Punkte aufsummieren
+        mask = np.isin(test_ids, start_ids)  # Nur Zeilen der Startelf (auch Doppel-GW)
+        pts = test_pts[mask]  # Punkte dieser Zeilen
+        result = float(pts.sum())  # Gesamtpunkte aufsummieren
+        if captain_id is not None:  # Kapitaen zaehlt doppelt
+            result += float(pts[test_ids[mask] == captain_id].sum())
         return result  # Gesamtpunkte zurueckgeben
 
     rows_team = {
@@ -291,7 +333,7 @@ def _evaluate_gw(  # Hilfsroutine fuer einzelne Spieltage
         "b2_team_points": team_real_points(team_b2),  # Reale Punkte des B2-Teams
     }  # Abschluss des Blockes
     return (
-        pd.DataFrame(rows_player),
+        mae_block,
         rows_team,
     )  # Rueckgabe der Spieler- und Teamresultate
 
@@ -306,22 +348,77 @@ def evaluate_span(  # Hauptschleife ueber alle Spieltage
     plots_dir: Path,
     random_state: int,
     dry_run: bool,
+    model_cache: Optional[ModelCache] = None,
+    workers: int = 0,
 ) -> None:
     ensure_dirs(out_dir, plots_dir)  # Sicherstellen, dass Ausgabepfade existieren
-    player_rows: List[pd.DataFrame] = []  # Sammelbehälter fuer Spieler-Metriken
+    if model_cache is None:  # Modelle je Trainings-Cutoff wiederverwenden
+        model_cache = {}
     team_rows: List[Dict[str, float]] = []  # Sammelbehälter fuer Team-Metriken
 
-    for gw in range(gw_start, gw_end + 1):  # Schleife ueber alle Zielspieltage
-        result = _evaluate_gw(
-            df, season, gw, formation_mode, random_state
-        )  # Einzelspieltag berechnen
+    gws = list(range(gw_start, gw_end + 1))  # Alle Zielspieltage
+    # Einmal stabil nach gw sortieren: jeder Train/Test-Split ist dann ein
+    # zusammenhaengender iloc-Bereich statt eines Masken-Scans ueber df
+    df = df.sort_values("gw", kind="mergesort")
+    gw_values = df["gw"].to_numpy(dtype=float)  # Sortierte Spieltage (NaN am Ende)
+    if workers <= 0:  # Automatisch: ein Thread pro Spieltag, hoechstens CPU-Anzahl
+        workers = min(len(gws), os.cpu_count() or 1) or 1
+    # Spieltage sind unabhaengig; Threads teilen df und Modell-Cache ohne Kopie
+    # (sklearn/pandas geben das GIL in den teuren Teilen frei)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(
+                _evaluate_gw,
+                df,
+                season,
+                gw,
+                formation_mode,
+                random_state,
+                model_cache,
+                gw_values,
+            )
+            for gw in gws
+        ]  # Einzelspieltage einreichen
+        results = [f.result() for f in futures]  # In Spieltag-Reihenfolge einsammeln
+
+    # Spieler-Metriken direkt in einen vorab angelegten Puffer schreiben
+    # (Obergrenze: je Spieltag Varianten x (ALL + alle Positionen der Saison))
+    positions = (
+        df["position"].dropna().astype(str).unique() if "position" in df.columns else []
+    )
+    pos_width = max([3, *(len(p) for p in positions)])  # "ALL" oder laengste Position
+    who_width = max(len(label) for label, _ in MAE_VARIANTS)
+    buf = np.empty(
+        len(gws) * len(MAE_VARIANTS) * (1 + len(positions)),
+        dtype=[
+            ("gw", "i8"),
+            ("who", f"U{who_width}"),
+            ("position", f"U{pos_width}"),
+            ("mae", "f8"),
+        ],
+    )
+    n_filled = 0  # Bereits belegte Zeilen im Puffer
+    labels = [label for label, _ in MAE_VARIANTS]
+
+    for result in results:  # Ergebnisse aller Zielspieltage durchgehen
         if result is None:  # Falls Spieltag ausgelassen wurde
             continue  # Naechsten Spieltag ansehen
-        player_rows.append(result[0])  # Spieler-Metriken hinzufuegen
-        team_rows.append(result[1])  # Team-Metriken hinzufuegen
+        (row_names, mae_values), rows_team = result
+        n_rows, n_variants = mae_values.shape
+        block = buf[n_filled : n_filled + n_rows * n_variants]
+        block["gw"] = rows_team["gw"]  # Spieltag
+        block["who"] = np.repeat(labels, n_rows)  # Je Variante ALL + Positionen
+        block["position"] = np.tile(np.asarray(row_names, dtype=str), n_variants)
+        block["mae"] = mae_values.T.reshape(-1)  # Variante-fuer-Variante
+        n_filled += len(block)
+        team_rows.append(rows_team)  # Team-Metriken hinzufuegen
 
     player_df = (
-        pd.concat(player_rows, ignore_index=True) if player_rows else pd.DataFrame()
+        pd.DataFrame.from_records(buf[:n_filled])
+        .astype({"who": object, "position": object})
+        .assign(season=season)[["season", "gw", "who", "position", "mae"]]
+        if n_filled
+        else pd.DataFrame()
     )  # Tabellen zusammenfuehren
     team_df = pd.DataFrame(team_rows)  # Teamresultate in DataFrame verwandeln
 
@@ -351,13 +448,17 @@ def evaluate_span(  # Hauptschleife ueber alle Spieltage
         return  # Keine Plots anlegen
 
     try:
-        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        # Eine einzige Figur (Agg-Canvas, ohne pyplot) fuer alle Diagramme
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
 
         # ----- PLAYER MAE -----
         if not player_df.empty:
             # Absoluter MAE (mit Zahlen über den Balken)
-            fig = plt.figure()
-            ax = plt.gca()
             summary = (
                 player_df[player_df["position"] == "ALL"]
                 .groupby("who")["mae"]
@@ -366,23 +467,18 @@ def evaluate_span(  # Hauptschleife ueber alle Spieltage
             )
             summary.plot(kind="bar", ax=ax)
             ax.set_ylabel("MAE (Ø über Zeitraum)")
-            for i, v in enumerate(summary.values):
-                ax.text(i, v, f"{v:.2f}", ha="center", va="bottom")
+            ax.bar_label(ax.containers[0], fmt="%.2f")
             save_plot(fig, plots_dir / "player_mae_bar.png")
 
             # Δ zu A1 (negativ = besser als A1) -> zeigt Unterschiede sofort
             base = summary.get("A1", summary.iloc[0])
             delta = summary - base
-            fig2 = plt.figure()
-            ax2 = plt.gca()
-            delta.plot(kind="bar", ax=ax2)
-            ax2.axhline(0, linewidth=1)
-            ax2.set_ylabel("Δ MAE vs A1 (↓ = besser)")
-            for i, v in enumerate(delta.values):
-                ax2.text(
-                    i, v, f"{v:+.2f}", ha="center", va="bottom" if v >= 0 else "top"
-                )
-            save_plot(fig2, plots_dir / "player_mae_delta_vs_A1.png")
+            ax.clear()
+            delta.plot(kind="bar", ax=ax)
+            ax.axhline(0, linewidth=1)
+            ax.set_ylabel("Δ MAE vs A1 (↓ = besser)")
+            ax.bar_label(ax.containers[0], fmt="%+.2f")
+            save_plot(fig, plots_dir / "player_mae_delta_vs_A1.png")
 
         # ----- TEAM PUNKTE -----
         if not team_df.empty:
@@ -391,39 +487,39 @@ def evaluate_span(  # Hauptschleife ueber alle Spieltage
                 "b1_team_points": "B1",
                 "b2_team_points": "B2",
             }
-            ymin = team_df[list(series.keys())].min().min()
-            ymax = team_df[list(series.keys())].max().max()
+            points = team_df[list(series.keys())].to_numpy(
+                dtype=float
+            )  # Matrix (GWs x Teams) fuer eine einzige Reduktion
+            ymin, ymax = np.nanmin(points), np.nanmax(points)
             pad = max(1.0, 0.05 * (ymax - ymin))
 
             if team_df["gw"].nunique() < 3:
                 # Wenige GWs -> gruppiertes Balkendiagramm mit Zahlen
-                fig = plt.figure()
-                ax = plt.gca()
+                ax.clear()
                 gws = team_df["gw"].to_numpy()
                 idx = np.arange(len(gws))
                 width = 0.25
-                for j, (col, label) in enumerate(series.items()):
-                    vals = team_df[col].to_numpy()
-                    ax.bar(idx + j * width, vals, width, label=label)
-                    for i, val in enumerate(vals):
-                        ax.text(
-                            idx[i] + j * width,
-                            val,
-                            f"{val:.1f}",
-                            ha="center",
-                            va="bottom",
-                        )
+                n_series = len(series)
+                bars = ax.bar(  # Alle Balken in einem Aufruf (Team fuer Team)
+                    (idx[None, :] + width * np.arange(n_series)[:, None]).ravel(),
+                    points.T.ravel(),
+                    width,
+                    color=np.repeat(
+                        [f"C{j}" for j in range(n_series)], len(gws)
+                    ).tolist(),
+                )
+                ax.bar_label(bars, fmt="%.1f")
+                handles = [bars[j * len(gws)] for j in range(n_series)]
                 ax.set_xticks(idx + width)
                 ax.set_xticklabels(gws)
                 ax.set_xlabel("GW")
                 ax.set_ylabel("Reale Team-Punkte")
                 ax.set_ylim(ymin - pad, ymax + pad)
-                ax.legend()
+                ax.legend(handles, list(series.values()))
                 save_plot(fig, plots_dir / "team_points_bar.png")
             else:
                 # Viele GWs -> Linien + Marker + Werte
-                fig = plt.figure()
-                ax = plt.gca()
+                ax.clear()
                 for col, label in series.items():
                     ax.plot(team_df["gw"], team_df[col], marker="o", label=label)
                     for x, y in zip(team_df["gw"], team_df[col]):
@@ -505,4 +601,5 @@ if __name__ == "__main__":  # Nur ausfuehren wenn Datei direkt gestartet wird
         plots_dir,
         args.random_state,
         args.dry_run,
+        workers=args.workers,
     )
@@ -4,8 +4,9 @@ Runs the same time-based train/test split twice per GW:
   - run_a: without ['home_flag','opp_def_xga_l5_adj']
   - run_b: with these features
 
-Trains a simple RandomForestRegressor on a compact feature set and reports MAE
-per GW and overall. Saves results to CSV and a plot ab_mae_per_gw.png.
+Trains a HistGradientBoostingRegressor (or, with --model rf, a
+RandomForestRegressor) on a compact feature set and reports MAE per GW and
+overall. Saves results to CSV and a plot ab_mae_per_gw.png.
 """
 
 from __future__ import annotations
@@ -13,11 +14,24 @@ from __future__ import annotations
 import argparse
 import importlib.util
 import pathlib
-from typing import List, Tuple
+from typing import Callable, Dict, List, Tuple
 
 import numpy as np
 import pandas as pd
-from sklearn.ensemble import RandomForestRegressor
+from sklearn.ensemble import HistGradientBoostingRegressor, RandomForestRegressor
+
+try:
+    from numba import njit, prange  # optional, JIT for the grouped rolling kernel
+except Exception:  # pragma: no cover - optional dependency
+    njit = None
+    prange = range
+
+try:  # optional GPU inference: RAPIDS cuML FIL fed via Treelite
+    import treelite
+    from cuml import ForestInference
+except Exception:  # pragma: no cover - optional dependency
+    treelite = None
+    ForestInference = None
 
 
 def _load_module(path: pathlib.Path):
@@ -29,32 +43,96 @@ def _load_module(path: pathlib.Path):
     return mod
 
 
+def _shift_roll_mean(values: np.ndarray, starts: np.ndarray, window: int) -> np.ndarray:
+    # Per group [starts[g], starts[g+1]): mean of the previous `window` non-NaN
+    # values (shift(1) + rolling(window, min_periods=1) within the group)
+    out = np.full(values.shape[0], np.nan)
+    for g in prange(starts.shape[0] - 1):
+        a, b = starts[g], starts[g + 1]
+        for i in range(a + 1, b):
+            total = 0.0
+            count = 0
+            for j in range(max(a, i - window), i):
+                v = values[j]
+                if not np.isnan(v):
+                    total += v
+                    count += 1
+            if count > 0:
+                out[i] = total / count
+    return out
+
+
+# Compiled kernels, one dispatcher per name for the whole process (several
+# seasons in one run share it). No cache=True: the on-disk cache pins the
+# importing module's name, so a cache written under one name breaks loading
+# this file under another. No fastmath: the kernels rely on NaN checks.
+_JIT_CACHE: Dict[str, Callable] = {}
+
+
+def _jit_kernel(name: str, func: Callable) -> Callable:
+    if njit is None:
+        return func
+    if name not in _JIT_CACHE:
+        _JIT_CACHE[name] = njit(parallel=True, nogil=True)(func)
+    return _JIT_CACHE[name]
+
+
+_shift_roll_mean = _jit_kernel("rolling_mean_shift", _shift_roll_mean)
+
+
+def _grouped_shift_roll(
+    out: pd.DataFrame, group_key: str, col: str, window: int = 3
+) -> np.ndarray:
+    # `out` is sorted by (group_key, gw); rows without a key stay NaN
+    codes, _ = pd.factorize(out[group_key], sort=False)
+    if njit is None:
+        shifted = out.groupby(group_key)[col].shift(1)
+        rolled = (
+            shifted.groupby(out[group_key])
+            .rolling(window, min_periods=1)
+            .mean()
+            .reset_index(level=0, drop=True)
+        )
+        return rolled.reindex(out.index).to_numpy(dtype=float)
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1], True])
+    values = pd.to_numeric(out[col], errors="coerce").to_numpy(dtype=float)
+    res = _shift_roll_mean(values, starts.astype(np.int64), window)
+    res[codes < 0] = np.nan
+    return res
+
+
+FEATURE_DTYPE_COLS = ("price", "ownership", "points_r3", "minutes_r3", "tp_per90_r3")
+
+
 def _prepare_base_features(df: pd.DataFrame) -> pd.DataFrame:
     # Rolling per player over past 3 matches, shifted by 1 (no leakage)
-    out = df.copy()
+    # sort_values returns a new frame, so df itself is never mutated
     out = (
-        out.sort_values(["player_id", "gw"])
-        if "player_id" in out.columns
-        else out.sort_values(["gw"])
+        df.sort_values(["player_id", "gw"])
+        if "player_id" in df.columns
+        else df.sort_values(["gw"])
     )
     group_key = "player_id" if "player_id" in out.columns else None
     if group_key:
         for col in ["points", "minutes"]:
             if col in out.columns:
-                out[f"{col}_r3"] = (
-                    out.groupby(group_key)[col]
-                    .shift(1)
-                    .rolling(3, min_periods=1)
-                    .mean()
-                )
+                out[f"{col}_r3"] = _grouped_shift_roll(out, group_key, col, 3)
         if {"points_r3", "minutes_r3"}.issubset(out.columns):
             out["tp_per90_r3"] = (
                 out["points_r3"] / out["minutes_r3"].replace(0, np.nan) * 90.0
             )
-    return out
+    # Model inputs only need float32 (the trees split on float32); cast once here
+    # after all derived features are computed from the float64 sources
+    feat_dtypes = {c: np.float32 for c in FEATURE_DTYPE_COLS if c in out.columns}
+    return out.astype(feat_dtypes)
+
 
+OPP_FEATURES = ("home_flag", "opp_def_xga_l5_adj")
 
-def _features_for(df: pd.DataFrame, with_opp: bool) -> Tuple[pd.DataFrame, List[str]]:
+
+def _features_for(
+    df: pd.DataFrame, with_opp: bool, fill_na: bool = True
+) -> Tuple[np.ndarray, List[str]]:
     # Candidate base features
     base_candidates = [
         "price",
@@ -66,32 +144,65 @@ def _features_for(df: pd.DataFrame, with_opp: bool) -> Tuple[pd.DataFrame, List[
     feats = [c for c in base_candidates if c in df.columns]
     if with_opp:
         # Opponent features if present
-        if "home_flag" in df.columns:
-            feats.append("home_flag")
-        if "opp_def_xga_l5_adj" in df.columns:
-            feats.append("opp_def_xga_l5_adj")
-    X = df[feats].fillna(0.0)
+        feats.extend(c for c in OPP_FEATURES if c in df.columns)
+    # Single float32 conversion with in-place NaN fill (trees split on float32 anyway);
+    # HistGradientBoosting handles NaN natively, so the fill is optional
+    X = np.ascontiguousarray(df[feats].to_numpy(dtype=np.float32))
+    if fill_na:
+        np.nan_to_num(X, copy=False, nan=0.0)
     return X, feats
 
 
-def _train_rf(X: pd.DataFrame, y: np.ndarray, random_state: int = 42):
-    rf = RandomForestRegressor(
-        n_estimators=300,
-        min_samples_leaf=2,
-        min_samples_split=4,
-        random_state=random_state,
-        n_jobs=-1,
-    )
+def _train_rf(X: np.ndarray, y: np.ndarray, random_state: int = 42, model: str = "hgb"):
+    if model == "rf":
+        # Only the A-vs-B difference matters, so trade some fit for speed:
+        # 70% bootstrap rows per tree, sqrt feature sampling, bounded depth
+        rf = RandomForestRegressor(
+            n_estimators=300,
+            max_samples=0.7,
+            max_features="sqrt",
+            min_samples_leaf=5,
+            max_depth=14,
+            random_state=random_state,
+            n_jobs=-1,
+        )
+    else:
+        # Histogram-binned boosting: far cheaper to fit than 300 full-depth trees
+        rf = HistGradientBoostingRegressor(
+            max_iter=300,
+            max_leaf_nodes=31,
+            learning_rate=0.05,
+            early_stopping=True,
+            random_state=random_state,
+        )
     rf.fit(X, y)
     return rf
 
 
+def _predict(
+    rf: RandomForestRegressor | HistGradientBoostingRegressor, X: np.ndarray
+) -> np.ndarray:
+    # cuML FIL when available (batched GPU/CPU inference), else sklearn predict
+    if ForestInference is not None:
+        try:
+            fil = ForestInference.load_from_treelite_model(
+                treelite.sklearn.import_model(rf), output_class=False
+            )
+            fil.optimize(batch_size=len(X))
+            preds = fil.predict(X)
+            return np.asarray(preds, dtype=float).reshape(-1)
+        except Exception as exc:
+            print(f"Warning: FIL inference failed ({exc}); using sklearn predict")
+    return rf.predict(X)
+
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--season", required=True)
     ap.add_argument("--opp_window", type=int, default=5)
     ap.add_argument("--opp_k", type=int, default=3)
     ap.add_argument("--out_dir", default="out/ab_eval")
+    ap.add_argument("--model", choices=["hgb", "rf"], default="hgb")
     args = ap.parse_args()
 
     repo = pathlib.Path(__file__).resolve().parent.parent
@@ -144,6 +255,20 @@ def main():
     last_gw = gws[-1]
     test_from = max(gws[0], last_gw - 7)
 
+    # gw -> row positions, built once; the RF bootstrap depends on row order,
+    # so train rows keep df_feat order (mask over a plain array, no Series ops)
+    gw_rows = df_feat.groupby("gw", sort=True).indices
+    gw_arr = df_feat["gw"].to_numpy(dtype=float)
+
+    # Opponent features are a row-wise (opponent, gw) lookup, so attach them once
+    # for run B and slice per GW; left merge keeps df_feat row order
+    df_feat_b = def_metrics.attach_opponent_features(df_feat, team_metrics)
+    if len(df_feat_b) == len(df_feat):
+        gw_rows_b, gw_arr_b = gw_rows, gw_arr
+    else:
+        gw_rows_b = df_feat_b.groupby("gw", sort=True).indices
+        gw_arr_b = df_feat_b["gw"].to_numpy(dtype=float)
+
     rows = []
     y_true_all_a, y_pred_all_a = [], []
     y_true_all_b, y_pred_all_b = [], []
@@ -151,20 +276,29 @@ def main():
     for gw in gws:
         if gw < test_from:
             continue
-        train = df_feat[df_feat["gw"] < gw].copy()
-        test = df_feat[df_feat["gw"] == gw].copy()
+        train = df_feat.take(np.flatnonzero(gw_arr < gw))
+        test = df_feat.take(gw_rows.get(gw, np.empty(0, dtype=np.intp)))
         if train.empty or test.empty:
             continue
 
-        # Attach opponent features to both train and test for run B (train to learn mapping)
-        train_b = def_metrics.attach_opponent_features(train, team_metrics)
-        test_b = def_metrics.attach_opponent_features(test, team_metrics)
-        # Run A (without opponent features)
-        Xa, feats_a = _features_for(train, with_opp=False)
-        Xtest_a, _ = _features_for(test, with_opp=False)
+        # Opponent features for both train and test of run B (train to learn mapping)
+        train_b = df_feat_b.take(np.flatnonzero(gw_arr_b < gw))
+        test_b = df_feat_b.take(gw_rows_b.get(gw, np.empty(0, dtype=np.intp)))
+        fill_na = args.model == "rf"
+        Xb, feats_b = _features_for(train_b, with_opp=True, fill_na=fill_na)
+        Xtest_b, _ = _features_for(test_b, with_opp=True, fill_na=fill_na)
+
+        # Run A (without opponent features): attach only appends columns, so the
+        # base features are the leading columns of B's matrices when rows align
+        n_base = sum(c not in OPP_FEATURES for c in feats_b)
+        if len(train_b) == len(train) and len(test_b) == len(test):
+            Xa, Xtest_a = Xb[:, :n_base], Xtest_b[:, :n_base]
+        else:
+            Xa, _ = _features_for(train, with_opp=False, fill_na=fill_na)
+            Xtest_a, _ = _features_for(test, with_opp=False, fill_na=fill_na)
         ya = train["points"].to_numpy(dtype=float)
-        rf_a = _train_rf(Xa, ya)
-        pred_a = rf_a.predict(Xtest_a)
+        rf_a = _train_rf(Xa, ya, model=args.model)
+        pred_a = _predict(rf_a, Xtest_a)
         truth = test["points"].to_numpy(dtype=float)
         mae_a = float(np.mean(np.abs(truth - pred_a))) if len(truth) else float("nan")
         rows.append({"run": "A", "gw": gw, "mae": mae_a, "n": int(len(truth))})
@@ -172,11 +306,9 @@ def main():
         y_pred_all_a.append(pred_a)
 
         # Run B (with opponent features)
-        Xb, feats_b = _features_for(train_b, with_opp=True)
-        Xtest_b, _ = _features_for(test_b, with_opp=True)
         yb = train_b["points"].to_numpy(dtype=float)
-        rf_b = _train_rf(Xb, yb)
-        pred_b = rf_b.predict(Xtest_b)
+        rf_b = _train_rf(Xb, yb, model=args.model)
+        pred_b = _predict(rf_b, Xtest_b)
         truth_b = test_b["points"].to_numpy(dtype=float)
         mae_b = (
             float(np.mean(np.abs(truth_b - pred_b))) if len(truth_b) else float("nan")
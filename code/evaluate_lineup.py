@@ -5,16 +5,38 @@ against hindsight-optimal lineups to measure decision quality.
 """
 
 import argparse
+import fnmatch
+import functools
 import glob
 import json
+import os
+import re
 import sys
-from itertools import combinations
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
+try:
+    import pyarrow as pa  # optional, typed column-projected CSV reads
+    import pyarrow.csv as pacsv
+except Exception:  # pragma: no cover - optional dependency
+    pa = None
+    pacsv = None
+
+try:
+    import orjson  # optional, faster lineup/metrics JSON
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    from numba import njit, prange  # optional, JIT for the evaluation kernels
+except Exception:  # pragma: no cover - optional dependency
+    njit = None
+    prange = range
+
 
 # FPL formation constraints
 ALLOWED_FORMATIONS = [
@@ -37,6 +59,46 @@ POS_SLOTS = {
     "5-4-1": {"GK": 1, "DEF": 5, "MID": 4, "FWD": 1},
 }
 
+# Integer position encoding; FORMATION_TUPLES holds the (GK, DEF, MID, FWD)
+# slot counts of every allowed formation as plain tuples
+POSITION_CODES = {"GK": 0, "DEF": 1, "MID": 2, "FWD": 3}
+FORMATION_TUPLES = frozenset(
+    tuple(POS_SLOTS[f][pos] for pos in POSITION_CODES) for f in ALLOWED_FORMATIONS
+)
+
+
+def _match_lineup_files(pattern: str) -> List[str]:
+    """Sorted paths of the files matching pattern.
+
+    Patterns with a wildcard only in the file name (the usual
+    'out/lineup_gw*.json') are matched in one os.scandir pass; anything else
+    goes through glob.
+
+    Args:
+        pattern: Glob pattern for lineup files
+
+    Returns:
+        Matching file paths, sorted
+    """
+    parent, name_glob = os.path.split(pattern)
+    if any(ch in parent for ch in "*?["):
+        return sorted(glob.glob(pattern))
+
+    regex = re.compile(fnmatch.translate(name_glob))
+    skip_hidden = not name_glob.startswith(".")  # same rule as glob
+    try:
+        with os.scandir(parent or ".") as it:
+            matches = [
+                os.path.join(parent, entry.name)
+                for entry in it
+                if regex.match(entry.name)
+                and not (skip_hidden and entry.name.startswith("."))
+                and entry.is_file()
+            ]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+    return sorted(matches)
+
 
 def load_lineups(pattern: str) -> List[Dict]:
     """Load all lineup JSON files matching the pattern.
@@ -51,7 +113,7 @@ def load_lineups(pattern: str) -> List[Dict]:
         FileNotFoundError: If no lineup files are found
         ValueError: If JSON files have unexpected structure
     """
-    lineup_files = glob.glob(pattern)
+    lineup_files = _match_lineup_files(pattern)
 
     if not lineup_files:
         raise FileNotFoundError(f"No lineup files found matching pattern: {pattern}")
@@ -60,10 +122,14 @@ def load_lineups(pattern: str) -> List[Dict]:
 
     all_lineups = []
 
-    for lineup_file in sorted(lineup_files):
+    for lineup_file in lineup_files:
         try:
-            with open(lineup_file, "r") as f:
-                data = json.load(f)
+            if orjson is not None:
+                with open(lineup_file, "rb") as f:
+                    data = orjson.loads(f.read())
+            else:
+                with open(lineup_file, "r") as f:
+                    data = json.load(f)
 
             # Validate required fields
             required_fields = {"gw", "xi_ids", "bench_gk_id", "bench_out_ids"}
@@ -94,6 +160,16 @@ def load_lineups(pattern: str) -> List[Dict]:
     return all_lineups
 
 
+# Columns read from merged_gw CSVs and their dtypes (GW fits int8; FPL points
+# are small integers, so int16 covers them)
+_ACTUALS_DTYPES = {
+    "element": "int32",
+    "GW": "int8",
+    "total_points": "int16",
+    "position": "str",
+}
+
+
 def load_actuals(data_paths: List[str]) -> pd.DataFrame:
     """Load actual points from merged gameweek CSV files.
 
@@ -115,11 +191,10 @@ def load_actuals(data_paths: List[str]) -> pd.DataFrame:
             continue
 
         try:
-            df = pd.read_csv(data_path)
-
-            # Check for required columns
-            required_cols = ["element", "GW", "total_points", "position"]
-            missing_cols = set(required_cols) - set(df.columns)
+            # Check for required columns (header only)
+            required_cols = list(_ACTUALS_DTYPES)
+            header = pd.read_csv(data_path, nrows=0).columns
+            missing_cols = set(required_cols) - set(header)
             if missing_cols:
                 print(
                     f"Warning: Missing columns in {data_path}: {missing_cols}",
@@ -127,8 +202,28 @@ def load_actuals(data_paths: List[str]) -> pd.DataFrame:
                 )
                 continue
 
+            # Parse only the four needed columns, with fixed small dtypes
+            if pacsv is not None:
+                table = pacsv.read_csv(
+                    data_path,
+                    read_options=pacsv.ReadOptions(use_threads=True),
+                    convert_options=pacsv.ConvertOptions(
+                        include_columns=required_cols,
+                        column_types={
+                            "element": pa.int32(),
+                            "GW": pa.int8(),
+                            "total_points": pa.int16(),
+                            "position": pa.string(),
+                        },
+                    ),
+                )
+                actuals = table.to_pandas()
+            else:
+                actuals = pd.read_csv(
+                    data_path, usecols=required_cols, dtype=_ACTUALS_DTYPES
+                )[required_cols]
+
             # Rename to standard names
-            actuals = df[required_cols].copy()
             actuals.columns = ["player_id", "gw", "total_points", "position"]
 
             all_actuals.append(actuals)
@@ -186,82 +281,216 @@ def load_squad_file(squad_path: str, gw: int) -> pd.DataFrame:
     return df
 
 
+def build_squad_arrays(squad_df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """Squad player_ids (int64) and their POSITION_CODES (int8, -1 if unknown).
+
+    Args:
+        squad_df: DataFrame with player_id and position columns
+
+    Returns:
+        Tuple of (squad_ids, squad_codes), row-aligned with squad_df
+    """
+    squad_ids = squad_df["player_id"].to_numpy(dtype=np.int64)
+    squad_codes = (
+        squad_df["position"].map(POSITION_CODES).fillna(-1).to_numpy(dtype=np.int8)
+    )
+    return squad_ids, squad_codes
+
+
+def build_position_codes(squad_df: pd.DataFrame) -> np.ndarray:
+    """Encode squad positions as an int8 array indexed by player_id.
+
+    Args:
+        squad_df: DataFrame with player_id and position columns
+
+    Returns:
+        Array where entry pid is the POSITION_CODES value of that player,
+        or -1 for ids outside the squad (or with an unknown position)
+    """
+    ids, squad_codes = build_squad_arrays(squad_df)
+    codes = np.full(int(ids.max()) + 1 if len(ids) else 0, -1, dtype=np.int8)
+    codes[ids] = squad_codes
+    return codes
+
+
 def validate_lineup(
     xi_ids: List[int],
     bench_gk_id: int,
     bench_out_ids: List[int],
-    squad_df: pd.DataFrame,
-) -> Dict[str, bool]:
+    pos_codes: np.ndarray,
+) -> Dict[str, Optional[bool]]:
     """Validate lineup against FPL rules.
 
     Args:
         xi_ids: List of 11 starting player IDs
         bench_gk_id: Bench goalkeeper ID
         bench_out_ids: List of bench outfield player IDs
-        squad_df: DataFrame with player_id and position columns
+        pos_codes: Squad positions by player_id (see build_position_codes)
 
     Returns:
-        Dictionary with validation flags
+        Dictionary with validation flags; has_1_gk_in_xi and valid_formation
+        are None (not checked) for structurally invalid lineups
     """
+    # All 15 ids in one int64 buffer; a missing bench GK is one distinct entry
+    n_xi = len(xi_ids)
+    all_ids = np.empty(n_xi + len(bench_out_ids) + 1, dtype=np.int64)
+    all_ids[:n_xi] = xi_ids
+    all_ids[n_xi + 1 :] = bench_out_ids
+    if bench_gk_id is None:
+        n_unique = np.unique(np.delete(all_ids, n_xi)).size + 1
+    else:
+        all_ids[n_xi] = bench_gk_id
+        n_unique = np.unique(all_ids).size
+
     validation = {
-        "exactly_11_xi": len(xi_ids) == 11,
+        "exactly_11_xi": n_xi == 11,
         "exactly_1_bench_gk": bench_gk_id is not None,
         "exactly_3_bench_out": len(bench_out_ids) == 3,
-        "no_duplicates": len(set(xi_ids + [bench_gk_id] + bench_out_ids)) == 15,
-        "has_1_gk_in_xi": False,
-        "valid_formation": False,
+        "no_duplicates": n_unique == 15,
+        "has_1_gk_in_xi": None,
+        "valid_formation": None,
     }
 
-    if not validation["exactly_11_xi"]:
+    # Position checks only run for structurally sound lineups; otherwise the
+    # lineup is invalid already and both position flags stay None (not checked)
+    if not (
+        validation["exactly_11_xi"]
+        and validation["exactly_3_bench_out"]
+        and validation["no_duplicates"]
+    ):
         return validation
 
-    # Create position lookup
-    pos_lookup = dict(zip(squad_df["player_id"], squad_df["position"]))
-
-    # Count positions in XI
-    xi_positions = [pos_lookup.get(pid, "UNKNOWN") for pid in xi_ids]
-    pos_counts = {
-        "GK": xi_positions.count("GK"),
-        "DEF": xi_positions.count("DEF"),
-        "MID": xi_positions.count("MID"),
-        "FWD": xi_positions.count("FWD"),
-    }
+    # Count positions in XI (players outside the squad are not counted)
+    xi = np.asarray(xi_ids, dtype=np.int64)
+    xi_codes = pos_codes[xi[(xi >= 0) & (xi < len(pos_codes))]]
+    pos_counts = np.bincount(xi_codes[xi_codes >= 0], minlength=4)
 
-    validation["has_1_gk_in_xi"] = pos_counts["GK"] == 1
+    validation["has_1_gk_in_xi"] = bool(pos_counts[POSITION_CODES["GK"]] == 1)
 
     # Check if formation is valid
-    for formation in ALLOWED_FORMATIONS:
-        if POS_SLOTS[formation] == pos_counts:
-            validation["valid_formation"] = True
-            break
+    validation["valid_formation"] = tuple(pos_counts.tolist()) in FORMATION_TUPLES
 
     return validation
 
 
-def compute_team_points(player_ids: List[int], actuals: pd.DataFrame, gw: int) -> float:
+# Cell value of build_points_matrix for a (gw, player_id) without a record
+_NO_RECORD = np.iinfo(np.int16).min
+
+
+def build_points_matrix(actuals: pd.DataFrame) -> np.ndarray:
+    """Lay actual points out as a dense (gw, player_id) int16 matrix.
+
+    Rows sharing a (gw, player_id) key (double gameweeks) are summed. Cells
+    without any actuals record hold _NO_RECORD.
+
+    Args:
+        actuals: DataFrame with player_id, gw, total_points
+
+    Returns:
+        Array of shape (max_gw + 1, max_player_id + 1)
+    """
+    per_player = actuals.groupby(["gw", "player_id"], sort=False)["total_points"].sum()
+    gws = per_player.index.get_level_values("gw").to_numpy(dtype=np.int64)
+    pids = per_player.index.get_level_values("player_id").to_numpy(dtype=np.int64)
+
+    shape = (int(gws.max()) + 1, int(pids.max()) + 1) if len(gws) else (0, 0)
+    points_mat = np.full(shape, _NO_RECORD, dtype=np.int16)
+    points_mat[gws, pids] = per_player.to_numpy(dtype=np.int16)
+    return points_mat
+
+
+def _gather_points(
+    points_mat: np.ndarray, gw: int, player_ids: List[int]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Actual points of player_ids in gw (0 where there is no record).
+
+    Returns the int16 points and a mask of the ids that have a record.
+    """
+    ids = np.asarray(player_ids, dtype=np.int64)
+    out = np.full(len(ids), _NO_RECORD, dtype=np.int16)
+    if 0 <= gw < points_mat.shape[0]:
+        inside = (ids >= 0) & (ids < points_mat.shape[1])
+        out[inside] = points_mat[gw, ids[inside]]
+    found = out != _NO_RECORD
+    out[~found] = 0
+    return out, found
+
+
+def compute_team_points(
+    player_ids: List[int], points_mat: np.ndarray, gw: int
+) -> float:
     """Compute total actual points for a list of players in a gameweek.
 
     Args:
         player_ids: List of player IDs
-        actuals: DataFrame with player_id, gw, total_points
+        points_mat: Points by (gw, player_id) (see build_points_matrix)
+        gw: Gameweek number
+
+    Returns:
+        Sum of actual points for the players (each distinct player once)
+    """
+    ids = np.unique(np.asarray(player_ids, dtype=np.int64))
+    points, _ = _gather_points(points_mat, gw, ids)
+    return float(points.sum(dtype=np.int64))
+
+
+def _squad_points_by_position(
+    squad_ids: np.ndarray, squad_codes: np.ndarray, points_mat: np.ndarray, gw: int
+) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """Gather the squad's actual points for a gameweek, split by position.
+
+    Args:
+        squad_ids: Squad player_ids (see build_squad_arrays)
+        squad_codes: Squad position codes (see build_squad_arrays)
+        points_mat: Points by (gw, player_id) (see build_points_matrix)
         gw: Gameweek number
 
     Returns:
-        Sum of actual points for the players
+        Dictionary mapping position to (player_ids, total_points) arrays;
+        players without a record score 0
+    """
+    points, _ = _gather_points(points_mat, gw, squad_ids)
+    points = points.astype(np.float64)
+
+    by_position = {}
+    for pos, code in POSITION_CODES.items():
+        mask = squad_codes == code
+        by_position[pos] = (squad_ids[mask], points[mask])
+    return by_position
+
+
+def _rank_by_position(
+    by_position: Dict[str, Tuple[np.ndarray, np.ndarray]],
+) -> Tuple[Dict[str, np.ndarray], Dict[str, np.ndarray]]:
+    """Rank each position's players by points, once.
+
+    Player points are independent, so a formation's best XI is the top-k
+    ranked players per position and its total the prefix sums at k.
+
+    Args:
+        by_position: Output of _squad_points_by_position
+
+    Returns:
+        Tuple of (ranked player_ids, prefix sums of ranked points) by position
     """
-    gw_actuals = actuals[actuals["gw"] == gw]
-    points = gw_actuals[gw_actuals["player_id"].isin(player_ids)]["total_points"].sum()
-    return float(points)
+    ranked_ids = {}
+    prefix = {}
+    for pos in ["GK", "DEF", "MID", "FWD"]:
+        ids, points = by_position[pos]
+        order = np.argsort(-points, kind="stable")
+        ranked_ids[pos] = ids[order]
+        prefix[pos] = np.concatenate(([0.0], np.cumsum(points[order])))
+    return ranked_ids, prefix
 
 
 def find_best_xi_for_formation(
-    squad_df: pd.DataFrame, actuals: pd.DataFrame, gw: int, formation: str
+    squad_df: pd.DataFrame, points_mat: np.ndarray, gw: int, formation: str
 ) -> Tuple[List[int], float]:
     """Find the best XI for a specific formation using actual points.
 
     Args:
         squad_df: DataFrame with player_id and position
-        actuals: DataFrame with player_id, gw, total_points
+        points_mat: Points by (gw, player_id) (see build_points_matrix)
         gw: Gameweek number
         formation: Formation string (e.g., '4-4-2')
 
@@ -271,94 +500,90 @@ def find_best_xi_for_formation(
     if formation not in POS_SLOTS:
         return [], 0.0
 
-    # Merge squad with actuals for this GW
-    gw_actuals = actuals[actuals["gw"] == gw][["player_id", "total_points"]]
-    squad_with_points = squad_df.merge(gw_actuals, on="player_id", how="left")
-    squad_with_points["total_points"] = squad_with_points["total_points"].fillna(0.0)
-
-    # Group by position
-    by_position = {}
-    for pos in ["GK", "DEF", "MID", "FWD"]:
-        by_position[pos] = squad_with_points[squad_with_points["position"] == pos]
+    by_position = _squad_points_by_position(
+        *build_squad_arrays(squad_df), points_mat, gw
+    )
+    ranked_ids, prefix = _rank_by_position(by_position)
 
     # Check if we have enough players for this formation
     slots = POS_SLOTS[formation]
-    for pos, needed in slots.items():
-        if len(by_position[pos]) < needed:
-            return [], 0.0  # Infeasible
+    if any(len(ranked_ids[pos]) < needed for pos, needed in slots.items()):
+        return [], 0.0  # Infeasible
 
-    best_xi = []
-    best_points = -1.0
+    best_points = float(sum(prefix[pos][needed] for pos, needed in slots.items()))
+    # Totals at or below the -1.0 sentinel never counted as an improvement
+    if best_points <= -1.0:
+        return [], -1.0
 
-    # Generate all valid combinations for this formation
-    # Sort each position by points descending for early pruning
-    pos_candidates = {}
+    best_xi = []
     for pos in ["GK", "DEF", "MID", "FWD"]:
-        sorted_pos = by_position[pos].sort_values("total_points", ascending=False)
-        pos_candidates[pos] = sorted_pos[["player_id", "total_points"]].values.tolist()
+        best_xi.extend(ranked_ids[pos][: slots[pos]].tolist())
+    return best_xi, best_points
 
-    # Try all combinations (brute force for small squad sizes)
-    for gk_combo in combinations(range(len(pos_candidates["GK"])), slots["GK"]):
-        gk_ids = [pos_candidates["GK"][i][0] for i in gk_combo]
-        gk_points = sum(pos_candidates["GK"][i][1] for i in gk_combo)
 
-        for def_combo in combinations(range(len(pos_candidates["DEF"])), slots["DEF"]):
-            def_ids = [pos_candidates["DEF"][i][0] for i in def_combo]
-            def_points = sum(pos_candidates["DEF"][i][1] for i in def_combo)
+def _best_xi_any_formation(
+    by_position: Dict[str, Tuple[np.ndarray, np.ndarray]],
+) -> Tuple[List[int], float, Optional[str]]:
+    """Best XI over all allowed formations from one sort per position.
 
-            for mid_combo in combinations(
-                range(len(pos_candidates["MID"])), slots["MID"]
-            ):
-                mid_ids = [pos_candidates["MID"][i][0] for i in mid_combo]
-                mid_points = sum(pos_candidates["MID"][i][1] for i in mid_combo)
+    Each position is ranked once; a formation's best total is then the sum of
+    per-position prefix sums at its slot counts, so formations are compared
+    with a few scalar additions instead of a top-k selection each. Ties and
+    infeasible formations resolve exactly as in the per-formation search.
 
-                for fwd_combo in combinations(
-                    range(len(pos_candidates["FWD"])), slots["FWD"]
-                ):
-                    fwd_ids = [pos_candidates["FWD"][i][0] for i in fwd_combo]
-                    fwd_points = sum(pos_candidates["FWD"][i][1] for i in fwd_combo)
+    Args:
+        by_position: Output of _squad_points_by_position
 
-                    total_points = gk_points + def_points + mid_points + fwd_points
+    Returns:
+        Tuple of (best_xi_ids, best_points, best_formation)
+    """
+    ranked_ids, prefix = _rank_by_position(by_position)
 
-                    if total_points > best_points:
-                        best_points = total_points
-                        best_xi = gk_ids + def_ids + mid_ids + fwd_ids
+    best_slots = None
+    best_points = -1.0
+    best_formation = None
+    for formation in ALLOWED_FORMATIONS:
+        slots = POS_SLOTS[formation]
+        if any(len(ranked_ids[pos]) < needed for pos, needed in slots.items()):
+            points, slots = 0.0, None  # Infeasible
+        else:
+            points = float(sum(prefix[pos][needed] for pos, needed in slots.items()))
+        if points > best_points:
+            best_points = points
+            best_slots = slots
+            best_formation = formation
 
-    return best_xi, best_points
+    best_xi = []
+    if best_slots is not None:
+        for pos in ["GK", "DEF", "MID", "FWD"]:
+            best_xi.extend(ranked_ids[pos][: best_slots[pos]].tolist())
+    return best_xi, best_points, best_formation
 
 
 def compute_hindsight_best_xi(
-    squad_df: pd.DataFrame, actuals: pd.DataFrame, gw: int
+    squad_ids: np.ndarray, squad_codes: np.ndarray, points_mat: np.ndarray, gw: int
 ) -> Tuple[List[int], float, Optional[str]]:
     """Find the best possible XI from the squad using hindsight (actual points).
 
     Args:
-        squad_df: DataFrame with player_id and position
-        actuals: DataFrame with player_id, gw, total_points
+        squad_ids: Squad player_ids (see build_squad_arrays)
+        squad_codes: Squad position codes (see build_squad_arrays)
+        points_mat: Points by (gw, player_id) (see build_points_matrix)
         gw: Gameweek number
 
     Returns:
         Tuple of (best_xi_ids, best_points, best_formation)
     """
-    best_xi = []
-    best_points = -1.0
-    best_formation = None
-
-    for formation in ALLOWED_FORMATIONS:
-        xi_ids, points = find_best_xi_for_formation(squad_df, actuals, gw, formation)
-        if points > best_points:
-            best_points = points
-            best_xi = xi_ids
-            best_formation = formation
+    # Gather squad points once; every formation reuses the same arrays
+    by_position = _squad_points_by_position(squad_ids, squad_codes, points_mat, gw)
 
-    return best_xi, best_points, best_formation
+    return _best_xi_any_formation(by_position)
 
 
 def compute_bench_loss(
     xi_ids: List[int],
     bench_out_ids: List[int],
-    squad_df: pd.DataFrame,
-    actuals: pd.DataFrame,
+    points_mat: np.ndarray,
     gw: int,
 ) -> float:
     """Compute points lost by benching players who would have improved the XI.
@@ -366,29 +591,31 @@ def compute_bench_loss(
     Args:
         xi_ids: Starting XI player IDs
         bench_out_ids: Benched outfield player IDs
-        squad_df: DataFrame with player_id and position
-        actuals: DataFrame with player_id, gw, total_points
+        points_mat: Points by (gw, player_id) (see build_points_matrix)
         gw: Gameweek number
 
     Returns:
         Total points that could have been gained by optimal bench decisions
     """
-    # Get actual points for XI and bench
-    gw_actuals = actuals[actuals["gw"] == gw][["player_id", "total_points"]]
-
-    xi_points = gw_actuals[gw_actuals["player_id"].isin(xi_ids)]
-    bench_points = gw_actuals[gw_actuals["player_id"].isin(bench_out_ids)]
-
-    if xi_points.empty or bench_points.empty:
+    # Get actual points for the distinct XI and bench players in one gather
+    # (players without a record are skipped)
+    xi_unique = np.unique(np.asarray(xi_ids, dtype=np.int64))
+    bench_unique = np.unique(np.asarray(bench_out_ids, dtype=np.int64))
+    points, found = _gather_points(points_mat, gw, np.r_[xi_unique, bench_unique])
+    n_xi = len(xi_unique)
+    xi_points, xi_found = points[:n_xi], found[:n_xi]
+    bench_points, bench_found = points[n_xi:], found[n_xi:]
+
+    if not xi_found.any() or not bench_found.any():
         return 0.0
 
     # Find minimum points in XI
-    min_xi_points = xi_points["total_points"].min()
+    min_xi_points = int(xi_points[xi_found].min())
 
     # Sum of bench points that exceed minimum XI points
-    bench_better = bench_points[bench_points["total_points"] > min_xi_points][
-        "total_points"
-    ].sum()
+    bench_better = int(
+        bench_points[bench_found & (bench_points > min_xi_points)].sum(dtype=np.int64)
+    )
 
     # Simplified bench loss: potential points left on bench
     # A more sophisticated version would consider formation constraints
@@ -397,15 +624,30 @@ def compute_bench_loss(
     return float(loss)
 
 
+# Hindsight results keyed by (sorted squad player_ids, gw)
+HindsightCache = Dict[
+    Tuple[Tuple[int, ...], int], Tuple[List[int], float, Optional[str]]
+]
+
+
 def evaluate_lineup(
-    lineup: Dict, actuals: pd.DataFrame, squad_df: pd.DataFrame
+    lineup: Dict,
+    squad_ids: np.ndarray,
+    squad_codes: np.ndarray,
+    points_mat: np.ndarray,
+    pos_codes: np.ndarray,
+    hindsight_cache: Optional[HindsightCache] = None,
 ) -> Dict:
     """Evaluate a single lineup against actuals.
 
     Args:
         lineup: Dictionary with gw, xi_ids, bench_gk_id, bench_out_ids
-        actuals: DataFrame with actual points
-        squad_df: DataFrame with squad information
+        squad_ids: Squad player_ids (see build_squad_arrays)
+        squad_codes: Squad position codes (see build_squad_arrays)
+        points_mat: Points by (gw, player_id) (see build_points_matrix)
+        pos_codes: Squad positions by player_id (see build_position_codes)
+        hindsight_cache: Optional cache shared across lineups, so a squad's
+            hindsight XI is computed only once per gameweek
 
     Returns:
         Dictionary with evaluation metrics
@@ -416,21 +658,25 @@ def evaluate_lineup(
     bench_out_ids = lineup["bench_out_ids"]
 
     # Validate lineup
-    validation = validate_lineup(xi_ids, bench_gk_id, bench_out_ids, squad_df)
+    validation = validate_lineup(xi_ids, bench_gk_id, bench_out_ids, pos_codes)
 
     # Compute actual team points
-    team_points_xi = compute_team_points(xi_ids, actuals, gw)
+    team_points_xi = compute_team_points(xi_ids, points_mat, gw)
 
-    # Compute hindsight best XI
-    hindsight_xi_ids, hindsight_points, hindsight_formation = compute_hindsight_best_xi(
-        squad_df, actuals, gw
-    )
+    # Compute hindsight best XI (once per squad and gameweek)
+    key = (tuple(sorted(squad_ids.tolist())), int(gw))
+    hindsight = hindsight_cache.get(key) if hindsight_cache is not None else None
+    if hindsight is None:
+        hindsight = compute_hindsight_best_xi(squad_ids, squad_codes, points_mat, gw)
+        if hindsight_cache is not None:
+            hindsight_cache[key] = hindsight
+    hindsight_xi_ids, hindsight_points, hindsight_formation = hindsight
 
     # Compute XI gap
     xi_gap = hindsight_points - team_points_xi
 
     # Compute bench loss
-    bench_loss = compute_bench_loss(xi_ids, bench_out_ids, squad_df, actuals, gw)
+    bench_loss = compute_bench_loss(xi_ids, bench_out_ids, points_mat, gw)
 
     return {
         "gw": int(gw),
@@ -444,6 +690,259 @@ def evaluate_lineup(
     }
 
 
+# Shared inputs of evaluate_lineup inside a pool worker, set once per process
+_WORKER_STATE: Dict = {}
+
+
+def _init_worker(state: Dict) -> None:
+    """Pool initializer: keep the shared evaluation inputs for this worker."""
+    _WORKER_STATE.update(state)
+
+
+def _evaluate_in_worker(lineup: Dict) -> Dict:
+    """Evaluate one lineup in a pool worker using _WORKER_STATE."""
+    return evaluate_lineup(lineup, **_WORKER_STATE)
+
+
+# Slot counts per POSITION_CODES column, one row per ALLOWED_FORMATIONS entry
+_FORMATION_SLOTS = np.array(
+    [[POS_SLOTS[f][pos] for pos in POSITION_CODES] for f in ALLOWED_FORMATIONS],
+    dtype=np.int64,
+)
+
+
+def _evaluate_lineups_kernel(
+    xi_ids: np.ndarray,
+    bench_gk_ids: np.ndarray,
+    bench_out_ids: np.ndarray,
+    gws: np.ndarray,
+    points_mat: np.ndarray,
+    no_record: int,
+    pos_codes: np.ndarray,
+    squad_ids: np.ndarray,
+    squad_codes: np.ndarray,
+    formation_slots: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Score stacked lineups (one per row) in parallel.
+
+    Mirrors evaluate_lineup: team points, hindsight points and formation index
+    (-1 for none), bench loss, and the no_duplicates / has_1_gk_in_xi /
+    valid_formation flags (columns 0-2 of the returned flag matrix; the
+    position flags are only checked when no_duplicates holds).
+    """
+    n, n_xi = xi_ids.shape
+    n_out = bench_out_ids.shape[1]
+    n_gw, n_pid = points_mat.shape
+    n_sq = squad_ids.shape[0]
+
+    team_points = np.zeros(n)
+    hindsight_points = np.empty(n)
+    hindsight_formation = np.empty(n, dtype=np.int64)
+    bench_loss = np.zeros(n)
+    flags = np.zeros((n, 3), dtype=np.bool_)
+
+    for i in prange(n):
+        gw = gws[i]
+        gw_ok = 0 <= gw < n_gw
+
+        # Team points and the XI minimum (players without a record skipped,
+        # repeated ids counted once)
+        total = 0
+        min_xi = 0
+        xi_found = False
+        for j in range(n_xi):
+            pid = xi_ids[i, j]
+            repeated = False
+            for m in range(j):
+                if xi_ids[i, m] == pid:
+                    repeated = True
+            if repeated:
+                continue
+            if gw_ok and 0 <= pid < n_pid and points_mat[gw, pid] != no_record:
+                p = np.int64(points_mat[gw, pid])
+                total += p
+                if not xi_found or p < min_xi:
+                    min_xi = p
+                xi_found = True
+        team_points[i] = total
+
+        # Bench loss
+        better = 0
+        bench_found = False
+        for j in range(n_out):
+            pid = bench_out_ids[i, j]
+            repeated = False
+            for m in range(j):
+                if bench_out_ids[i, m] == pid:
+                    repeated = True
+            if repeated:
+                continue
+            if gw_ok and 0 <= pid < n_pid and points_mat[gw, pid] != no_record:
+                p = np.int64(points_mat[gw, pid])
+                bench_found = True
+                if xi_found and p > min_xi:
+                    better += p
+        if xi_found and bench_found:
+            bench_loss[i] = max(0.0, float(better - min_xi * n_out))
+
+        # Duplicates across XI, bench GK and bench outfield
+        all_ids = np.empty(n_xi + 1 + n_out, dtype=np.int64)
+        all_ids[:n_xi] = xi_ids[i]
+        all_ids[n_xi] = bench_gk_ids[i]
+        all_ids[n_xi + 1 :] = bench_out_ids[i]
+        all_ids.sort()
+        n_unique = 1
+        for k in range(1, all_ids.shape[0]):
+            if all_ids[k] != all_ids[k - 1]:
+                n_unique += 1
+        flags[i, 0] = n_unique == 15
+
+        # XI positions, only for structurally sound lineups
+        if n_xi == 11 and n_out == 3 and flags[i, 0]:
+            counts = np.zeros(4, dtype=np.int64)
+            for j in range(n_xi):
+                pid = xi_ids[i, j]
+                if 0 <= pid < pos_codes.shape[0] and pos_codes[pid] >= 0:
+                    counts[pos_codes[pid]] += 1
+            flags[i, 1] = counts[0] == 1
+            for f in range(formation_slots.shape[0]):
+                if (formation_slots[f] == counts).all():
+                    flags[i, 2] = True
+                    break
+
+        # Hindsight: rank each position once, compare formations by prefix sums
+        pos_points = np.zeros((4, n_sq))
+        pos_n = np.zeros(4, dtype=np.int64)
+        for k in range(n_sq):
+            c = squad_codes[k]
+            if c < 0:
+                continue
+            pid = squad_ids[k]
+            p = 0.0
+            if gw_ok and 0 <= pid < n_pid and points_mat[gw, pid] != no_record:
+                p = float(points_mat[gw, pid])
+            pos_points[c, pos_n[c]] = p
+            pos_n[c] += 1
+        prefix = np.zeros((4, n_sq + 1))
+        for c in range(4):
+            ranked = np.sort(pos_points[c, : pos_n[c]])[::-1]
+            for k in range(pos_n[c]):
+                prefix[c, k + 1] = prefix[c, k] + ranked[k]
+
+        best = -1.0
+        best_f = -1
+        for f in range(formation_slots.shape[0]):
+            pts = 0.0
+            for c in range(4):
+                if pos_n[c] < formation_slots[f, c]:
+                    pts = 0.0  # Infeasible
+                    break
+                pts += prefix[c, formation_slots[f, c]]
+            if pts > best:
+                best = pts
+                best_f = f
+        hindsight_points[i] = best
+        hindsight_formation[i] = best_f
+
+    return team_points, hindsight_points, hindsight_formation, bench_loss, flags
+
+
+if njit is not None:
+    # No cache=True: the on-disk cache of a parallel kernel pins the importing
+    # module's name, so a cache written under one name breaks loading this
+    # file under another
+    _evaluate_lineups_kernel = njit(parallel=True, nogil=True)(
+        _evaluate_lineups_kernel
+    )
+
+
+def _evaluate_lineups_numba(
+    lineups: List[Dict],
+    squad_ids: np.ndarray,
+    squad_codes: np.ndarray,
+    points_mat: np.ndarray,
+    pos_codes: np.ndarray,
+) -> List[Optional[Dict]]:
+    """Evaluate all regular lineups (11 XI, bench GK, 3 bench) in one kernel call.
+
+    Args:
+        lineups: Lineup dictionaries as returned by load_lineups
+        squad_ids: Squad player_ids (see build_squad_arrays)
+        squad_codes: Squad position codes (see build_squad_arrays)
+        points_mat: Points by (gw, player_id) (see build_points_matrix)
+        pos_codes: Squad positions by player_id (see build_position_codes)
+
+    Returns:
+        One evaluate_lineup-style result per lineup, or None for lineups the
+        kernel cannot take (the caller evaluates those one by one)
+    """
+    results: List[Optional[Dict]] = [None] * len(lineups)
+    regular = [
+        i
+        for i, lineup in enumerate(lineups)
+        if len(lineup["xi_ids"]) == 11
+        and lineup["bench_gk_id"] is not None
+        and len(lineup["bench_out_ids"]) == 3
+    ]
+    if not regular:
+        return results
+
+    batch = [lineups[i] for i in regular]
+    team, hindsight, formation_idx, bench, flags = _evaluate_lineups_kernel(
+        np.array([lineup["xi_ids"] for lineup in batch], dtype=np.int64),
+        np.array([lineup["bench_gk_id"] for lineup in batch], dtype=np.int64),
+        np.array([lineup["bench_out_ids"] for lineup in batch], dtype=np.int64),
+        np.array([lineup["gw"] for lineup in batch], dtype=np.int64),
+        points_mat,
+        int(_NO_RECORD),
+        pos_codes,
+        squad_ids,
+        squad_codes,
+        _FORMATION_SLOTS,
+    )
+
+    for k, i in enumerate(regular):
+        checked = bool(flags[k, 0])  # as validate_lineup: positions need no dups
+        validation = {
+            "exactly_11_xi": True,
+            "exactly_1_bench_gk": True,
+            "exactly_3_bench_out": True,
+            "no_duplicates": checked,
+            "has_1_gk_in_xi": bool(flags[k, 1]) if checked else None,
+            "valid_formation": bool(flags[k, 2]) if checked else None,
+        }
+        f = int(formation_idx[k])
+        results[i] = {
+            "gw": int(batch[k]["gw"]),
+            "team_points_xi": float(team[k]),
+            "hindsight_points": float(hindsight[k]),
+            "hindsight_formation": ALLOWED_FORMATIONS[f] if f >= 0 else None,
+            "xi_gap": float(hindsight[k] - team[k]),
+            "bench_loss": float(bench[k]),
+            "validation": validation,
+            "is_valid": all(validation.values()),
+        }
+    return results
+
+
+# Per-lineup metrics gathered by aggregate_metrics, and the validation flags
+# whose failures it counts
+_METRIC_DTYPE = np.dtype(
+    [
+        ("xi_gap", "f8"),
+        ("bench_loss", "f8"),
+        ("team_points_xi", "f8"),
+        ("hindsight_points", "f8"),
+    ]
+)
+_VALIDATION_KEYS = [
+    "exactly_11_xi",
+    "has_1_gk_in_xi",
+    "valid_formation",
+    "no_duplicates",
+]
+
+
 def aggregate_metrics(evaluations: List[Dict]) -> Dict:
     """Aggregate metrics across all evaluations.
 
@@ -456,33 +955,45 @@ def aggregate_metrics(evaluations: List[Dict]) -> Dict:
     if not evaluations:
         return {}
 
-    xi_gaps = [e["xi_gap"] for e in evaluations]
-    bench_losses = [e["bench_loss"] for e in evaluations]
-    valid_count = sum(1 for e in evaluations if e["is_valid"])
+    n = len(evaluations)
+
+    # One pass over the evaluations fills the preallocated metric columns and
+    # the validity / validation-failure counters together
+    values = np.empty(n, dtype=_METRIC_DTYPE)
+    valid_count = 0
+    fail_counts = [0] * len(_VALIDATION_KEYS)
+    for i, e in enumerate(evaluations):
+        values[i] = (
+            e["xi_gap"],
+            e["bench_loss"],
+            e["team_points_xi"],
+            e["hindsight_points"],
+        )
+        valid_count += bool(e["is_valid"])
+        v = e["validation"]
+        for k, key in enumerate(_VALIDATION_KEYS):
+            fail_counts[k] += v[key] is False  # None: not checked
 
     # Collect validation failures
     validation_summary = {
-        "total_lineups": len(evaluations),
+        "total_lineups": n,
         "valid_lineups": valid_count,
-        "validity_rate": valid_count / len(evaluations) if evaluations else 0.0,
+        "validity_rate": valid_count / n,
     }
-
-    # Count specific validation issues
-    for key in ["exactly_11_xi", "has_1_gk_in_xi", "valid_formation", "no_duplicates"]:
-        failures = sum(1 for e in evaluations if not e["validation"][key])
+    for key, failures in zip(_VALIDATION_KEYS, fail_counts):
         validation_summary[f"{key}_failures"] = failures
 
+    xi_gaps = values["xi_gap"]
+    bench_losses = values["bench_loss"]
     return {
-        "n_lineups": len(evaluations),
-        "mean_xi_gap": float(np.mean(xi_gaps)),
+        "n_lineups": n,
+        "mean_xi_gap": float(xi_gaps.mean()),
         "median_xi_gap": float(np.median(xi_gaps)),
-        "total_xi_gap": float(np.sum(xi_gaps)),
-        "mean_bench_loss": float(np.mean(bench_losses)),
-        "total_bench_loss": float(np.sum(bench_losses)),
-        "mean_team_points": float(np.mean([e["team_points_xi"] for e in evaluations])),
-        "mean_hindsight_points": float(
-            np.mean([e["hindsight_points"] for e in evaluations])
-        ),
+        "total_xi_gap": float(xi_gaps.sum()),
+        "mean_bench_loss": float(bench_losses.mean()),
+        "total_bench_loss": float(bench_losses.sum()),
+        "mean_team_points": float(values["team_points_xi"].mean()),
+        "mean_hindsight_points": float(values["hindsight_points"].mean()),
         "validation": validation_summary,
     }
 
@@ -559,8 +1070,12 @@ def save_results(
 
     # Save metrics as JSON
     metrics_file = output_path / "metrics_lineup.json"
-    with open(metrics_file, "w") as f:
-        json.dump(metrics_output, f, indent=2)
+    if orjson is not None:
+        with open(metrics_file, "wb") as f:
+            f.write(orjson.dumps(metrics_output, option=orjson.OPT_INDENT_2))
+    else:
+        with open(metrics_file, "w") as f:
+            json.dump(metrics_output, f, indent=2)
     print(f"\nSaved metrics to: {metrics_file}")
 
 
@@ -612,6 +1127,13 @@ Example usage:
         help="Output directory for results (default: out)",
     )
 
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Worker processes for evaluating lineups (0 = auto, 1 = serial)",
+    )
+
     args = parser.parse_args()
 
     try:
@@ -627,6 +1149,7 @@ Example usage:
         print("=" * 70)
         data_paths = [args.data_22_23, args.data_23_24]
         actuals = load_actuals(data_paths)
+        points_mat = build_points_matrix(actuals)
 
         # Load squad file
         print("\n" + "=" * 70)
@@ -642,22 +1165,72 @@ Example usage:
                 f"\nWarning: Squad file has {len(squad_df)} players (expected 15)",
                 file=sys.stderr,
             )
+        squad_ids, squad_codes = build_squad_arrays(squad_df)
+        pos_codes = build_position_codes(squad_df)
 
         # Evaluate each lineup
         print("\n" + "=" * 70)
         print("Evaluating lineups...")
         print("=" * 70)
         evaluations = []
-        for lineup in lineups:
+
+        # With numba, all regular lineups are scored in one parallel kernel
+        # call; the rest (or all of them without numba) go lineup by lineup
+        batch: List[Optional[Dict]] = [None] * len(lineups)
+        if njit is not None:
             try:
-                result = evaluate_lineup(lineup, actuals, squad_df)
-                evaluations.append(result)
-                print(
-                    f"  Evaluated GW{lineup['gw']}: gap={result['xi_gap']:.1f}, valid={result['is_valid']}"
+                batch = _evaluate_lineups_numba(
+                    lineups, squad_ids, squad_codes, points_mat, pos_codes
                 )
             except Exception as e:
-                print(f"Error evaluating GW{lineup['gw']}: {e}", file=sys.stderr)
-                continue
+                print(
+                    f"Warning: Batched evaluation failed, evaluating one by one: {e}",
+                    file=sys.stderr,
+                )
+        todo = [lineup for lineup, result in zip(lineups, batch) if result is None]
+
+        state = {
+            "squad_ids": squad_ids,
+            "squad_codes": squad_codes,
+            "points_mat": points_mat,
+            "pos_codes": pos_codes,
+            "hindsight_cache": {},  # one cache per process
+        }
+        workers = args.workers
+        if workers <= 0:
+            workers = min(len(todo), os.cpu_count() or 1)
+
+        # Lineups are independent; worker processes receive the shared inputs
+        # once through the initializer instead of with every task
+        pool = None
+        if workers > 1 and len(todo) > 1:
+            pool = ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker, initargs=(state,)
+            )
+            pending = [
+                pool.submit(_evaluate_in_worker, lineup).result for lineup in todo
+            ]
+        else:
+            pending = [
+                functools.partial(evaluate_lineup, lineup, **state) for lineup in todo
+            ]
+
+        try:
+            remaining = iter(pending)
+            for lineup, result in zip(lineups, batch):
+                try:
+                    if result is None:
+                        result = next(remaining)()
+                    evaluations.append(result)
+                    print(
+                        f"  Evaluated GW{lineup['gw']}: gap={result['xi_gap']:.1f}, valid={result['is_valid']}"
+                    )
+                except Exception as e:
+                    print(f"Error evaluating GW{lineup['gw']}: {e}", file=sys.stderr)
+                    continue
+        finally:
+            if pool is not None:
+                pool.shutdown()
 
         if not evaluations:
             print("\nError: No lineups could be evaluated", file=sys.stderr)
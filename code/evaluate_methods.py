@@ -10,18 +10,36 @@ Usage:
 """
 
 import argparse
+import functools
+import hashlib
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 import numpy as np
 from numpy.typing import ArrayLike
 import pandas as pd
-from sklearn.metrics import mean_absolute_error, mean_squared_error
-from scipy.stats import spearmanr
+from scipy.stats import rankdata
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+try:
+    import pyarrow  # optional, pandas' pyarrow CSV engine
+except Exception:  # pragma: no cover - optional dependency
+    pyarrow = None
+
+try:
+    import orjson  # optional, faster prediction JSON
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    from numba import njit  # optional, JIT for the Spearman kernel
+except Exception:  # pragma: no cover - optional dependency
+    njit = None
+
 # Import make_predictions functions
 import sys
 
@@ -33,33 +51,32 @@ DATA_DIR = ROOT / "data"
 OUT_DIR = ROOT / "out"
 OUT_DIR.mkdir(parents=True, exist_ok=True)
 
+# Bump to invalidate the cached merged frames when _process_gw's output changes
+SCHEMA_VERSION = 1
 
-def load_actual_points(season: str, gw: int) -> pd.DataFrame:
-    """Load actual points for a specific gameweek.
-
-    Args:
-        season: Season identifier
-        gw: Gameweek number
 
-    Returns:
-        DataFrame with player_id, gw, actual_points
-    """
+def _season_csv_path(season: str) -> Optional[Path]:
+    """Merged GW data file used for a season's actuals, or None if missing."""
     # Lade historische GW-Daten
     possible_files = [
         DATA_DIR / f"merged_gw_{season}.csv",
         DATA_DIR / "merged_gw_2022-23.csv",
         DATA_DIR / "merged_gw_2024-25.csv",
     ]
-
-    df = None
     for csv_path in possible_files:
         if csv_path.exists():
-            df = pd.read_csv(csv_path)
-            break
+            return csv_path
+    return None
 
-    if df is None:
-        raise FileNotFoundError(f"No data file found for season {season}")
 
+@functools.lru_cache(maxsize=4)
+def _load_season_csv(season: str) -> pd.DataFrame:
+    """Load and standardize the merged GW data of a season.
+
+    Cached so that every (method, gw) pair shares one parse of the CSV.
+    The returned DataFrame is shared between callers and must not be
+    modified in place.
+    """
     # Standardisiere Spalten
     rename_map = {
         "element": "player_id",
@@ -70,19 +87,107 @@ def load_actual_points(season: str, gw: int) -> pd.DataFrame:
         "total_points": "actual_points",
         "points": "actual_points",
     }
+
+    csv_path = _season_csv_path(season)
+    if csv_path is None:
+        raise FileNotFoundError(f"No data file found for season {season}")
+
+    # Only parse the columns that are or become the standard ones
+    header = pd.read_csv(csv_path, nrows=0).columns
+    wanted = set(rename_map) | {"player_id", "gw", "actual_points"}
+    usecols = [c for c in header if c in wanted]
+    if pyarrow is not None and usecols:
+        df = pd.read_csv(csv_path, usecols=usecols, engine="pyarrow")
+    else:
+        df = pd.read_csv(csv_path, usecols=usecols)
+
     df = df.rename(columns={k: v for k, v in rename_map.items() if k in df.columns})
 
+    if "player_id" not in df.columns or "actual_points" not in df.columns:
+        raise ValueError("Missing required columns in data file")
+
+    return df
+
+
+def load_actual_points(season: str, gw: int) -> pd.DataFrame:
+    """Load actual points for a specific gameweek.
+
+    Args:
+        season: Season identifier
+        gw: Gameweek number
+
+    Returns:
+        DataFrame with actual_points (float32), indexed by player_id (int32)
+    """
+    df = _load_season_csv(season)
+
     # Filtere auf spezifische GW
     if "gw" in df.columns:
         df = df[df["gw"] == gw]
 
-    if "player_id" not in df.columns or "actual_points" not in df.columns:
-        raise ValueError("Missing required columns in data file")
-
     # Aggregiere falls es Duplikate gibt (z.B. mehrere Fixtures pro GW)
-    result = df.groupby("player_id")["actual_points"].sum().reset_index()
+    result = df.groupby("player_id")["actual_points"].sum().to_frame()
+
+    # Same key dtype as the predictions, so evaluate_method can join on index
+    result.index = result.index.astype("int32")
+    return result.astype({"actual_points": "float32"})
 
-    return result
+
+def _rank_pearson(r_p: np.ndarray, r_a: np.ndarray) -> float:
+    """Spearman correlation as the Pearson correlation of (average) ranks.
+
+    Skips the p-value that scipy.stats.spearmanr computes and we discard.
+    Constant input has no defined correlation and gives NaN, as in spearmanr.
+    """
+    if np.std(r_p) > 0 and np.std(r_a) > 0:
+        return float(np.corrcoef(r_p, r_a)[0, 1])
+    return np.nan
+
+
+def _average_ranks(x: np.ndarray) -> np.ndarray:
+    """1-based ranks of x, ties sharing their average rank (rankdata default)."""
+    n = x.size
+    order = np.argsort(x)
+    ranks = np.empty(n, dtype=np.float64)
+    i = 0
+    while i < n:
+        j = i
+        while j + 1 < n and x[order[j + 1]] == x[order[i]]:
+            j += 1
+        rank = 0.5 * (i + j) + 1.0
+        for k in range(i, j + 1):
+            ranks[order[k]] = rank
+        i = j + 1
+    return ranks
+
+
+def _spearman_kernel(predictions: np.ndarray, actuals: np.ndarray) -> float:
+    """Spearman correlation of two NaN-free float64 arrays of equal size.
+
+    Same result as _rank_pearson on rankdata ranks, without the temporaries.
+    """
+    r_p = _average_ranks(predictions)
+    r_a = _average_ranks(actuals)
+    n = r_p.size
+    mean_p = r_p.mean()
+    mean_a = r_a.mean()
+    s_pa = 0.0
+    s_pp = 0.0
+    s_aa = 0.0
+    for i in range(n):
+        d_p = r_p[i] - mean_p
+        d_a = r_a[i] - mean_a
+        s_pa += d_p * d_a
+        s_pp += d_p * d_p
+        s_aa += d_a * d_a
+    if s_pp == 0.0 or s_aa == 0.0:
+        return np.nan
+    return s_pa / np.sqrt(s_pp * s_aa)
+
+
+if njit is not None:
+    _average_ranks = njit(cache=True, nogil=True)(_average_ranks)
+    _spearman_kernel = njit(cache=True, nogil=True)(_spearman_kernel)
 
 
 def calculate_metrics(predictions: ArrayLike, actuals: ArrayLike) -> Dict[str, float]:
@@ -106,28 +211,17 @@ def calculate_metrics(predictions: ArrayLike, actuals: ArrayLike) -> Dict[str, f
     if predictions.size == 0:
         return {"mae": np.nan, "rmse": np.nan, "spearman": np.nan}
 
-    mae = mean_absolute_error(actuals, predictions)
-    rmse = np.sqrt(mean_squared_error(actuals, predictions))
+    diff = predictions - actuals
+    mae = np.abs(diff).mean()
+    rmse = np.sqrt(np.square(diff).mean())
 
     # Spearman correlation
+    spearman_value = np.nan
     if predictions.size > 1:
-        res = spearmanr(predictions, actuals)
-        # scipy.stats.spearmanr may return (corr, pvalue) or an object with .correlation
-        if isinstance(res, tuple):
-            spearman_corr = res[0]
+        if njit is not None:
+            spearman_value = _spearman_kernel(predictions, actuals)
         else:
-            spearman_corr = getattr(res, "correlation", np.nan)
-        # Ensure spearman_corr is a scalar numeric value before converting to float
-        if isinstance(spearman_corr, (int, float, np.floating)):
-            spearman_value = float(spearman_corr)
-        else:
-            try:
-                # Try to extract numeric value from array-like or other types (e.g., 0-d numpy)
-                spearman_value = float(np.asarray(spearman_corr).item())
-            except Exception:
-                spearman_value = np.nan
-    else:
-        spearman_value = np.nan
+            spearman_value = _rank_pearson(rankdata(predictions), rankdata(actuals))
 
     return {
         "mae": float(mae),
@@ -154,104 +248,240 @@ def apply_pos_method(predictions_data: Dict[str, Any]) -> Dict[str, Any]:
     """Apply position-based average method."""
     result = predictions_data.copy()
 
-    # Calculate average by position
-    players = result["players"]
-    by_pos = {}
-    for player in players:
-        pos = player["pos"]
-        if pos not in by_pos:
-            by_pos[pos] = []
-        by_pos[pos].append(player["predicted_points"])
-
-    # Calculate averages
-    pos_avg = {pos: np.mean(points) for pos, points in by_pos.items()}
-
     # Replace predictions with position averages
-    for player in players:
-        player["predicted_points"] = pos_avg[player["pos"]]
+    players = pd.DataFrame(result["players"])
+    if not players.empty:
+        players["pos"] = players["pos"].astype("category")
+        players["predicted_points"] = players.groupby("pos", observed=True)[
+            "predicted_points"
+        ].transform("mean")
+    result["players"] = players.to_dict("records")
 
     result["model_version"] = result["model_version"] + "+pos"
     return result
 
 
-def evaluate_method(
-    method: str, season: str, gw_start: int, gw_end: int, skip_generation: bool = False
-) -> pd.DataFrame:
-    """Evaluate a single method across gameweeks.
+def load_actuals_by_gw(
+    season: str, gw_start: int, gw_end: int
+) -> Dict[int, pd.DataFrame]:
+    """Load actual points for a range of gameweeks.
+
+    Gameweeks whose actuals cannot be loaded are reported and left out.
 
     Args:
-        method: Method name (rf, ma3, pos)
         season: Season identifier
         gw_start: First gameweek
         gw_end: Last gameweek
-        skip_generation: If True, load existing predictions instead of generating
 
     Returns:
-        DataFrame with player_id, gw, predicted_points, actual_points
+        Dictionary mapping gameweek to its actual points DataFrame
     """
-    all_results = []
+    actuals_by_gw = {}
+    for gw in range(gw_start, gw_end + 1):
+        try:
+            actuals_by_gw[gw] = load_actual_points(season, gw)
+        except Exception as e:
+            print(f"  Warning: Could not load actuals for GW {gw}: {e}")
+    return actuals_by_gw
 
-    print(f"\n{'='*60}")
-    print(f"Evaluating method: {method.upper()}")
-    print(f"{'='*60}")
 
-    # Load and prepare training data once
-    df, features = load_and_prepare_data(season)
-    max_gw = int(df["gw"].max())
-    test_gw_start = max(df["gw"].min(), max_gw - 7)
+def _merged_cache_path(season: str, gw: int, method: str, pred_file: Path) -> Path:
+    """Parquet cache path for a merged gameweek frame.
 
-    # Train model once
-    model = train_model(df, features, test_gw_start)
+    Keyed by the content of the predictions file (which includes its
+    model_version), so regenerating identical predictions still hits, and by
+    the path, size and mtime of the season's actuals file, so a corrected or
+    extended merged_gw CSV is read again.
+    """
+    h = hashlib.sha1(f"{SCHEMA_VERSION}|{season}|{gw}|{method}|".encode())
+    csv_path = _season_csv_path(season)
+    if csv_path is not None:
+        stat = csv_path.stat()
+        h.update(f"{csv_path.resolve()}|{stat.st_size}|{stat.st_mtime_ns}|".encode())
+    h.update(pred_file.read_bytes())
+    return OUT_DIR / f"merged_{season}_gw{gw}_{method}_{h.hexdigest()[:12]}.parquet"
 
-    for gw in range(gw_start, gw_end + 1):
-        print(f"\nProcessing GW {gw}...")
 
-        # Check if predictions already exist
-        pred_file = OUT_DIR / f"predictions_gw{gw}.json"
+def _write_merged_cache(merged: pd.DataFrame, cache_path: Path) -> None:
+    """Write a merged frame, replacing older entries for the same gameweek.
+
+    Older entries share the (season, gw, method) part of the name and differ
+    only in the 12-character digest.
+    """
+    stale_pattern = cache_path.name[: -len(".parquet") - 12] + "?" * 12 + ".parquet"
+    for old in cache_path.parent.glob(stale_pattern):
+        if old != cache_path:
+            old.unlink(missing_ok=True)
+    merged.to_parquet(cache_path, engine="pyarrow", compression="zstd")
+
+
+def _process_gw(
+    gw: int,
+    method: str,
+    season: str,
+    model: Any,
+    features: List[str],
+    skip_generation: bool = False,
+    actuals_by_gw: Optional[Dict[int, pd.DataFrame]] = None,
+) -> Optional[pd.DataFrame]:
+    """Predict one gameweek with a method and match it with the actual points.
 
-        if skip_generation and pred_file.exists():
-            print(f"  Loading existing predictions from {pred_file}")
+    Returns:
+        DataFrame with player_id, gw, method, predicted_points, actual_points,
+        or None if the gameweek has no actuals or no matching players
+    """
+    print(f"\nProcessing GW {gw}...")
+
+    # Check if predictions already exist
+    pred_file = OUT_DIR / f"predictions_gw{gw}.json"
+
+    cache_path = None
+    if skip_generation and pred_file.exists():
+        if pyarrow is not None:
+            cache_path = _merged_cache_path(season, gw, method, pred_file)
+            if cache_path.exists():
+                print(f"  Loading cached results from {cache_path}")
+                return pd.read_parquet(cache_path, engine="pyarrow")
+
+        print(f"  Loading existing predictions from {pred_file}")
+        if orjson is not None:
+            with open(pred_file, "rb") as f:
+                predictions_data = orjson.loads(f.read())
+        else:
             with open(pred_file, "r") as f:
                 predictions_data = json.load(f)
+    else:
+        # Generate predictions
+        print("  Generating predictions...")
+        predictions_data = generate_predictions(model, features, season, gw, "rf")
+
+        # Save for later use
+        if orjson is not None:
+            with open(pred_file, "wb") as f:
+                f.write(
+                    orjson.dumps(
+                        predictions_data,
+                        option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY,
+                    )
+                )
         else:
-            # Generate predictions
-            print("  Generating predictions...")
-            predictions_data = generate_predictions(model, features, season, gw, "rf")
-
-            # Save for later use
             with open(pred_file, "w") as f:
                 json.dump(predictions_data, f, indent=4)
-
-        # Apply method transformation
-        if method == "ma3":
-            predictions_data = apply_ma3_method(predictions_data)
-        elif method == "pos":
-            predictions_data = apply_pos_method(predictions_data)
-        # rf stays as is
-
-        # Load actual points
+        if pyarrow is not None:
+            cache_path = _merged_cache_path(season, gw, method, pred_file)
+
+    # Apply method transformation
+    if method == "ma3":
+        predictions_data = apply_ma3_method(predictions_data)
+    elif method == "pos":
+        predictions_data = apply_pos_method(predictions_data)
+    # rf stays as is
+
+    # Load actual points
+    if actuals_by_gw is not None:
+        actuals = actuals_by_gw.get(gw)
+        if actuals is None:
+            print(f"  Warning: No actuals for GW {gw}")
+            return None
+    else:
         try:
             actuals = load_actual_points(season, gw)
         except Exception as e:
             print(f"  Warning: Could not load actuals for GW {gw}: {e}")
-            continue
+            return None
 
-        # Merge predictions with actuals
-        pred_df = pd.DataFrame(predictions_data["players"])
-        merged = pred_df.merge(actuals, on="player_id", how="inner")
+    # Merge predictions with actuals, keeping only the output columns
+    pred_df = (
+        pd.DataFrame(
+            predictions_data["players"], columns=["player_id", "predicted_points"]
+        )
+        .astype({"player_id": "int32", "predicted_points": "float32"})
+        .set_index("player_id")
+    )
+    merged = pred_df.join(actuals, how="inner").reset_index()
 
-        if len(merged) == 0:
-            print(f"  Warning: No matching players for GW {gw}")
-            continue
+    if len(merged) == 0:
+        print(f"  Warning: No matching players for GW {gw}")
+        return None
 
-        merged["gw"] = gw
-        merged["method"] = method
-        all_results.append(
-            merged[["player_id", "gw", "method", "predicted_points", "actual_points"]]
-        )
+    # Columns: player_id, gw, method, predicted_points, actual_points
+    merged.insert(1, "gw", gw)
+    merged.insert(2, "method", method)
+    print(f"  Matched {len(merged)} players")
+
+    if cache_path is not None:
+        _write_merged_cache(merged, cache_path)
+    return merged
+
+
+_WORKER_STATE: Dict = {}
+
+
+def _init_worker(state: Dict) -> None:
+    """Pool initializer: keep the trained model and shared inputs for this worker."""
+    _WORKER_STATE.update(state)
+
+
+def _process_gw_in_worker(gw: int) -> Optional[pd.DataFrame]:
+    """Process one gameweek in a pool worker using _WORKER_STATE."""
+    return _process_gw(gw, **_WORKER_STATE)
+
+
+def evaluate_method(
+    method: str,
+    model: Any,
+    features: List[str],
+    season: str,
+    gw_start: int,
+    gw_end: int,
+    skip_generation: bool = False,
+    actuals_by_gw: Optional[Dict[int, pd.DataFrame]] = None,
+    workers: int = 0,
+) -> pd.DataFrame:
+    """Evaluate a single method across gameweeks.
+
+    Args:
+        method: Method name (rf, ma3, pos)
+        model: Trained model used to generate predictions
+        features: Feature columns the model was trained on
+        season: Season identifier
+        gw_start: First gameweek
+        gw_end: Last gameweek
+        skip_generation: If True, load existing predictions instead of generating
+        actuals_by_gw: Preloaded actual points per gameweek (see
+            load_actuals_by_gw); loaded here if not given
+        workers: Worker processes for the gameweeks (0 = auto, 1 = serial)
+
+    Returns:
+        DataFrame with player_id, gw, predicted_points, actual_points
+    """
+    print(f"\n{'='*60}")
+    print(f"Evaluating method: {method.upper()}")
+    print(f"{'='*60}")
 
-        print(f"  Matched {len(merged)} players")
+    state = {
+        "method": method,
+        "season": season,
+        "model": model,
+        "features": features,
+        "skip_generation": skip_generation,
+        "actuals_by_gw": actuals_by_gw,
+    }
+    gws = range(gw_start, gw_end + 1)
+    if workers <= 0:
+        workers = min(len(gws), os.cpu_count() or 1)
+
+    # Gameweeks are independent once the model is trained; worker processes
+    # receive the model once through the initializer instead of with every gw
+    if workers > 1 and len(gws) > 1:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(state,)
+        ) as pool:
+            results = list(pool.map(_process_gw_in_worker, gws))
+    else:
+        results = [_process_gw(gw, **state) for gw in gws]
 
+    all_results = [r for r in results if r is not None]
     if not all_results:
         print(f"  No results found for {method}")
         return pd.DataFrame()
@@ -259,6 +489,13 @@ def evaluate_method(
     return pd.concat(all_results, ignore_index=True)
 
 
+def _group_spearman(d: pd.DataFrame) -> float:
+    """Spearman correlation of one method's precomputed point ranks."""
+    if len(d) < 2:
+        return np.nan
+    return _rank_pearson(d["predicted_rank"].to_numpy(), d["actual_rank"].to_numpy())
+
+
 def create_comparison_table(
     results_df: pd.DataFrame, metrics: List[str]
 ) -> pd.DataFrame:
@@ -271,21 +508,47 @@ def create_comparison_table(
     Returns:
         DataFrame with methods as rows and metrics as columns
     """
-    comparison = []
-
-    for method in results_df["method"].unique():
-        method_data = results_df[results_df["method"] == method]
-
-        predictions = method_data["predicted_points"].values
-        actuals = method_data["actual_points"].values
-
-        metrics_dict = calculate_metrics(predictions, actuals)
-        metrics_dict["method"] = method
-        metrics_dict["n_predictions"] = len(predictions)
-
-        comparison.append(metrics_dict)
+    # n_predictions counts every row; the metrics skip rows with NaNs, as
+    # calculate_metrics does
+    n_predictions = results_df.groupby("method", sort=False, observed=True).size()
+
+    predictions = results_df["predicted_points"].to_numpy(dtype=float)
+    actuals = results_df["actual_points"].to_numpy(dtype=float)
+    valid = ~(np.isnan(predictions) | np.isnan(actuals))
+    err = predictions[valid] - actuals[valid]
+    scored = pd.DataFrame(
+        {
+            "method": results_df["method"].to_numpy()[valid],
+            "abs_err": np.abs(err),
+            "sq_err": err * err,
+            "predicted_points": predictions[valid],
+            "actual_points": actuals[valid],
+        }
+    )
 
-    comparison_df = pd.DataFrame(comparison)
+    # One groupby pass for all methods
+    g = scored.groupby("method", sort=False, observed=True)
+    mae = g["abs_err"].mean()
+    rmse = np.sqrt(g["sq_err"].mean())
+
+    # Rank predicted and actual points of all methods in one call, so the
+    # per-method Spearman only correlates the ranks
+    ranks = g[["predicted_points", "actual_points"]].rank()
+    scored["predicted_rank"] = ranks["predicted_points"].to_numpy()
+    scored["actual_rank"] = ranks["actual_points"].to_numpy()
+    g = scored.groupby("method", sort=False, observed=True)
+    spearman = pd.Series({method: _group_spearman(d) for method, d in g}, dtype=float)
+
+    methods = n_predictions.index
+    comparison_df = pd.DataFrame(
+        {
+            "mae": mae.reindex(methods).to_numpy(dtype=float),
+            "rmse": rmse.reindex(methods).to_numpy(dtype=float),
+            "spearman": spearman.reindex(methods).to_numpy(dtype=float),
+            "method": methods.to_numpy(),
+            "n_predictions": n_predictions.to_numpy(),
+        }
+    )
 
     # Reorder columns
     cols = ["method", "n_predictions"] + [
@@ -362,6 +625,12 @@ def main():
         action="store_true",
         help="Skip prediction generation, use existing files",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Worker processes for evaluating gameweeks (0 = auto, 1 = serial)",
+    )
 
     args = parser.parse_args()
 
@@ -376,11 +645,30 @@ def main():
     print(f"Metrics: {', '.join(metrics)}")
     print(f"{'='*70}")
 
+    # Load and prepare training data once for all methods
+    df, features = load_and_prepare_data(args.season)
+    max_gw = int(df["gw"].max())
+    test_gw_start = max(df["gw"].min(), max_gw - 7)
+
+    # Train model once for all methods
+    model = train_model(df, features, test_gw_start)
+
+    # Load actual points once for all methods
+    actuals_by_gw = load_actuals_by_gw(args.season, args.gw_start, args.gw_end)
+
     # Evaluate each method
     all_results = []
     for method in args.compare:
         method_results = evaluate_method(
-            method, args.season, args.gw_start, args.gw_end, args.skip_generation
+            method,
+            model,
+            features,
+            args.season,
+            args.gw_start,
+            args.gw_end,
+            args.skip_generation,
+            actuals_by_gw,
+            args.workers,
         )
         if not method_results.empty:
             all_results.append(method_results)
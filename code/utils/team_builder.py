@@ -36,42 +36,13 @@ POS_SLOTS = {  # Anzahl Startelfplaetze je Position pro Formation
 }  # Abschluss des Blockes
 
 
-def _prepare_candidates(
+def _with_pred_points(
     candidates: pd.DataFrame,
-) -> pd.DataFrame:  # Sortiert Kandidaten nach Tie-Break-Regeln
-    df = candidates.copy()  # Kopie der Kandidaten bilden
-    if "pred_points" not in df.columns:  # Falls Prognosewerte fehlen
-        logging.warning(
-            "pred_points fehlen - verwende 0 als Platzhalter"
-        )  # Warnung ausgeben
-        df["pred_points"] = 0.0  # Nullwerte einsetzen
-    sort_config = [  # Sortierprioritaet definieren
-        ("pred_points", False, -np.inf),  # Zuerst nach Prognosepunkten (absteigend)
-        ("p90_last", False, -np.inf),  # Danach nach p90_last (absteigend)
-        ("price", False, -np.inf),  # Dann nach Preis (absteigend)
-        ("player_id", True, np.inf),  # Zuletzt nach Spieler-ID (aufsteigend)
-    ]
-    sort_cols: List[str] = []  # Liste der Hilfsspalten fuer Sortierung
-    ascending: List[bool] = []  # Sortierreihenfolge pro Spalte
-    temp_cols: List[str] = []  # Namen der Hilfsspalten zum spaeteren Loeschen
-    for col, asc, fill_value in sort_config:  # Ueber jede Regel iterieren
-        if col not in df.columns:  # Wenn Spalte fehlt
-            continue  # Naechste Regel pruefen
-        temp_col = f"__sort_{col}"  # Hilfsspalte benennen
-        temp_cols.append(temp_col)  # Namen merken
-        sort_cols.append(temp_col)  # In Sortierliste aufnehmen
-        ascending.append(asc)  # Passende Richtung merken
-        values = pd.to_numeric(
-            df[col], errors="coerce"
-        )  # Werte robust in Zahlen verwandeln
-        df[temp_col] = values.fillna(
-            fill_value
-        )  # Fehlende Werte durch Default ersetzen
-    if sort_cols:  # Nur sortieren wenn Regeln vorhanden
-        df = df.sort_values(
-            by=sort_cols, ascending=ascending, kind="mergesort"
-        )  # Stabile Sortierung anwenden
-    return df.drop(columns=temp_cols, errors="ignore")  # Hilfsspalten wieder entfernen
+) -> pd.DataFrame:  # Stellt die Spalte pred_points sicher
+    if "pred_points" in candidates.columns:  # Prognosewerte vorhanden
+        return candidates
+    logging.warning("pred_points fehlen - verwende 0 als Platzhalter")  # Warnung
+    return candidates.assign(pred_points=0.0)  # Nullwerte einsetzen
 
 
 def build_team(  # Baut ein Team fuer eine feste Formation
@@ -79,36 +50,92 @@ def build_team(  # Baut ein Team fuer eine feste Formation
     formation: str,
     budget: float = 100.0,
     max_per_club: int = 3,
+) -> Dict:
+    return build_teams(  # Gleicher Greedy-Teambau wie fuer mehrere Scorespalten
+        _with_pred_points(candidates),
+        ["pred_points"],
+        formation,
+        budget=budget,
+        max_per_club=max_per_club,
+    )[0]
+
+
+def choose_best_formation(  # Durchprobieren aller Formationen
+    candidates: pd.DataFrame, formations: List[str]
+) -> Tuple[str, Dict]:
+    return choose_best_formations(  # Gleiche Auswahl wie fuer mehrere Scorespalten
+        _with_pred_points(candidates), ["pred_points"], formations
+    )[0]
+
+
+def _rank_scores(  # Tie-Break-Reihenfolge fuer mehrere Scorespalten auf einmal
+    candidates: pd.DataFrame, score_cols: List[str]
+) -> Tuple[np.ndarray, np.ndarray]:
+    n = len(candidates)  # Anzahl Kandidaten
+    base = np.arange(n)  # Ausgangsreihenfolge (stabil)
+    # Tie-Break: Score absteigend, dann p90_last und price absteigend, zuletzt
+    # player_id aufsteigend; fehlende Werte jeweils ganz hinten
+    for col, asc, fill_value in reversed(  # Nebenkriterien nach dem Score
+        [
+            ("p90_last", False, -np.inf),
+            ("price", False, -np.inf),
+            ("player_id", True, np.inf),
+        ]
+    ):
+        if col not in candidates.columns:  # Fehlende Spalte ueberspringen
+            continue
+        key = (
+            pd.to_numeric(candidates[col], errors="coerce")
+            .fillna(fill_value)
+            .to_numpy(dtype=float)
+        )  # Werte robust in Zahlen verwandeln
+        key = key[base] if asc else -key[base]  # Absteigend per Vorzeichenwechsel
+        base = base[np.argsort(key, kind="stable")]  # Stabil nachsortieren
+    scores = (
+        candidates[score_cols]
+        .apply(pd.to_numeric, errors="coerce")
+        .to_numpy(dtype=float)
+        .reshape(n, len(score_cols))
+    )  # Prognosespalten als Matrix (Zeilen x Scores)
+    keys = np.nan_to_num(scores[base], nan=-np.inf)  # Fehlende Scores ganz hinten
+    order = base[
+        np.argsort(-keys, axis=0, kind="stable")
+    ]  # Je Spalte: Score absteigend, Gleichstaende nach Nebenkriterien
+    return scores, order
+
+
+def _build_ranked(  # Greedy-Teambau entlang einer vorberechneten Reihenfolge
+    records: List[Dict],
+    positions: List,
+    prices: List,
+    clubs: List,
+    ids: Optional[np.ndarray],
+    score: np.ndarray,
+    order: np.ndarray,
+    formation: str,
+    budget: float,
+    max_per_club: int,
 ) -> Dict:
     if formation not in POS_SLOTS:  # Gueltigkeit der Formation pruefen
         raise ValueError(
             f"Unbekannte Formation: {formation}"
         )  # Fehler fuer Anwender ausgeben
     slots = POS_SLOTS[formation].copy()  # Verbleibende Slots je Position kopieren
-    team = {  # Ergebnisstruktur vorbereiten
-        "formation": formation,
-        "start_xi": [],
-        "bench": [],
-        "captain": None,
-        "vice_captain": None,
-        "spent": 0.0,
-    }  # Abschluss des Blockes
     club_counts: Dict[str, int] = {}  # Anzahl Spieler pro Klub verfolgen
     spent = 0.0  # Bisher ausgegebenes Budget
-
-    ordered = _prepare_candidates(candidates)  # Kandidaten nach Tie-Break sortieren
-    for _, row in ordered.iterrows():  # Jeden Kandidaten durchgehen
-        pos = row.get("position")  # Position auslesen
+    picked: List[int] = []  # Zeilenpositionen der Startelf
+    for i in order:  # Kandidaten in Tie-Break-Reihenfolge
+        pos = positions[i]  # Position auslesen
         if pos not in slots or slots[pos] <= 0:  # Wenn kein Platz mehr frei ist
             continue  # Naechster Spieler
-        price = float(row.get("price", 0.0) or 0.0)  # Preis robust bestimmen
+        price = float(prices[i] or 0.0)  # Preis robust bestimmen
         if spent + price > budget + 1e-9:  # Budgetgrenze pruefen
             continue  # Spieler ueberspringen
-        club = row.get("club")  # Klub auslesen
+        club = clubs[i]  # Klub auslesen
         if club:
             if club_counts.get(club, 0) >= max_per_club:  # Klublimit pruefen
                 continue  # Spieler ueberspringen
-        team["start_xi"].append(row.to_dict())  # Spieler in Startelf uebernehmen
+        picked.append(i)  # Spieler in Startelf uebernehmen
         slots[pos] -= 1  # Slotverbrauch aktualisieren
         spent += price  # Budget anpassen
         if club:
@@ -116,7 +143,6 @@ def build_team(  # Baut ein Team fuer eine feste Formation
         if sum(slots.values()) == 0:  # Wenn alle Plaetze belegt sind
             break  # Schleife beenden
 
-    team["spent"] = spent  # Verbrauchtes Budget sichern
     remaining_slots = sum(max(0, v) for v in slots.values())  # Uebrige Slots pruefen
     if remaining_slots > 0:  # Falls nicht alle Plaetze gefuellt wurden
         logging.warning(
@@ -125,70 +151,108 @@ def build_team(  # Baut ein Team fuer eine feste Formation
             remaining_slots,
         )
 
-    start_df = pd.DataFrame(team["start_xi"])  # Startelf in DataFrame verwandeln
-    if not start_df.empty:  # Falls Spieler vorhanden sind
-        sorted_start = _prepare_candidates(start_df)  # Startelf fuer Kapitaen sortieren
-        team["captain"] = sorted_start.iloc[0].to_dict()  # Bester Spieler als Kapitaen
-        team["vice_captain"] = (  # Zweiter Spieler als Vize, sonst wieder Erster
-            sorted_start.iloc[1].to_dict()
-            if len(sorted_start) > 1
-            else sorted_start.iloc[0].to_dict()
-        )
-    else:
-        team["captain"] = None  # Kein Kapitaen moeglich
-        team["vice_captain"] = None  # Kein Vize moeglich
-
-    start_ids = set(start_df.get("player_id", []))  # IDs der Startelf sichern
-    if "player_id" in ordered.columns:  # Pruefen ob IDs vorhanden sind
-        bench_pool = ordered[
-            ~ordered["player_id"].isin(start_ids)
-        ]  # Restliche Spieler als Bankkandidaten
+    def _row(i: int) -> Dict:  # Zeile samt Prognosepunkten wie in build_team
+        return {**records[i], "pred_points": score[i]}
+
+    start_xi = [_row(i) for i in picked]  # Startelf in Auswahlreihenfolge
+    if ids is not None:  # Bank: beste Nicht-Startelf-Spieler
+        bench_rows = order[~np.isin(ids[order], ids[picked])][:4]
     else:
-        bench_pool = ordered.iloc[0:0]  # Leerer DataFrame als Fallback
-    bench_sorted = _prepare_candidates(bench_pool).iloc[
-        :4
-    ]  # Top-4 fuer die Bank waehlen
-    team["bench"] = [
-        row.to_dict() for _, row in bench_sorted.iterrows()
-    ]  # Bankeintraege speichern
-    return team  # Fertiges Team zurueckgeben
+        bench_rows = order[:0]  # Ohne IDs keine Bank
+    return {
+        "formation": formation,
+        "start_xi": start_xi,
+        "bench": [_row(i) for i in bench_rows],
+        "captain": start_xi[0] if start_xi else None,  # Bester Spieler als Kapitaen
+        "vice_captain": (  # Zweiter Spieler als Vize, sonst wieder Erster
+            start_xi[1] if len(start_xi) > 1 else start_xi[0] if start_xi else None
+        ),
+        "spent": spent,
+    }  # Abschluss des Blockes
 
 
-def choose_best_formation(  # Durchprobieren aller Formationen
-    candidates: pd.DataFrame, formations: List[str]
-) -> Tuple[str, Dict]:
-    best_form = None  # Beste Formation initialisieren
-    best_team: Dict | None = None  # Passendes Team merken
-    best_points = -np.inf  # Vergleichswert fuer Prognosepunkte
-    scored_candidates = candidates.copy()  # Kopie der Kandidaten erstellen
-    if "pred_points" not in scored_candidates.columns:  # Prognosewerte sicherstellen
-        scored_candidates["pred_points"] = 0.0  # Nullwerte als Fallback
-    for formation in formations:  # Jede Formation testen
-        try:
-            team = build_team(scored_candidates, formation)  # Team fuer Formation bauen
-        except Exception as exc:  # Fehler auffangen
-            logging.warning(
-                "Formation %s uebersprungen: %s", formation, exc
-            )  # Hinweis ausgeben
-            continue  # Naechste Formation testen
-        start_xi = team["start_xi"]  # Startelf auslesen
-        if not start_xi:  # Falls kein gueltiges Team entstand
-            expected_points = -np.inf  # Schlechte Bewertung vergeben
-        else:
-            ids = [p.get("player_id") for p in start_xi]  # Spieler-IDs sammeln
-            expected_points = (
-                scored_candidates.set_index("player_id")["pred_points"]
-                .reindex(ids)
-                .fillna(0.0)
-                .sum()
-            )  # Prognosepunkte aufsummieren
-        if expected_points > best_points:  # Besseres Ergebnis gefunden?
-            best_points = expected_points  # Vergleichswert aktualisieren
-            best_form = formation  # Formation merken
-            best_team = team  # Team merken
-    if best_form is None or best_team is None:  # Falls keine Formation erfolgreich war
-        raise ValueError("Keine gueltige Formation gefunden")  # Fehler melden
-    return best_form, best_team  # Beste Formation samt Team zurueckgeben
+def _ranked_inputs(  # Liest die fuer den Teambau noetigen Spalten einmal aus
+    candidates: pd.DataFrame,
+) -> Tuple[List[Dict], List, List, List, Optional[np.ndarray]]:
+    def column(col: str, default) -> List:  # Spalte als Liste oder Default
+        if col in candidates.columns:
+            return candidates[col].tolist()
+        return [default] * len(candidates)
+
+    ids = (
+        candidates["player_id"].to_numpy()
+        if "player_id" in candidates.columns
+        else None
+    )  # Spieler-IDs fuer die Bank
+    return (
+        candidates.to_dict("records"),  # Zeilen einmal als Dictionaries
+        column("position", None),
+        column("price", 0.0),
+        column("club", None),
+        ids,
+    )
+
+
+def build_teams(  # Wie build_team, aber fuer mehrere Scorespalten auf einmal
+    candidates: pd.DataFrame,
+    score_cols: List[str],
+    formation: str,
+    budget: float = 100.0,
+    max_per_club: int = 3,
+) -> List[Dict]:
+    scores, order = _rank_scores(candidates, score_cols)  # Einmal sortieren
+    inputs = _ranked_inputs(candidates)  # Spalten einmal auslesen
+    return [
+        _build_ranked(
+            *inputs, scores[:, j], order[:, j], formation, budget, max_per_club
+        )
+        for j in range(len(score_cols))
+    ]  # Ein Team je Scorespalte
+
+
+def choose_best_formations(  # Wie choose_best_formation fuer mehrere Scorespalten
+    candidates: pd.DataFrame,
+    score_cols: List[str],
+    formations: List[str],
+    budget: float = 100.0,
+    max_per_club: int = 3,
+) -> List[Tuple[str, Dict]]:
+    scores, order = _rank_scores(candidates, score_cols)  # Einmal sortieren
+    inputs = _ranked_inputs(candidates)  # Spalten einmal auslesen
+    results: List[Tuple[str, Dict]] = []  # Beste Formation je Scorespalte
+    for j in range(len(score_cols)):  # Jede Scorespalte einzeln bewerten
+        best_form = None  # Beste Formation initialisieren
+        best_team: Dict | None = None  # Passendes Team merken
+        best_points = -np.inf  # Vergleichswert fuer Prognosepunkte
+        by_id = pd.Series(
+            scores[:, j], index=candidates["player_id"]
+        )  # Prognosepunkte je Spieler-ID
+        for formation in formations:  # Jede Formation testen
+            try:
+                team = _build_ranked(
+                    *inputs, scores[:, j], order[:, j], formation, budget, max_per_club
+                )  # Team fuer Formation bauen
+            except Exception as exc:  # Fehler auffangen
+                logging.warning(
+                    "Formation %s uebersprungen: %s", formation, exc
+                )  # Hinweis ausgeben
+                continue  # Naechste Formation testen
+            start_xi = team["start_xi"]  # Startelf auslesen
+            if not start_xi:  # Falls kein gueltiges Team entstand
+                expected_points = -np.inf  # Schlechte Bewertung vergeben
+            else:
+                ids = [p.get("player_id") for p in start_xi]  # Spieler-IDs sammeln
+                expected_points = (
+                    by_id.reindex(ids).fillna(0.0).sum()
+                )  # Prognosepunkte aufsummieren
+            if expected_points > best_points:  # Besseres Ergebnis gefunden?
+                best_points = expected_points  # Vergleichswert aktualisieren
+                best_form = formation  # Formation merken
+                best_team = team  # Team merken
+        if best_form is None or best_team is None:  # Keine Formation erfolgreich
+            raise ValueError("Keine gueltige Formation gefunden")  # Fehler melden
+        results.append((best_form, best_team))  # Ergebnis dieser Scorespalte
+    return results  # Beste Formation samt Team je Scorespalte
 
 
 # ─────────────────────────────────────────────────────────────────────
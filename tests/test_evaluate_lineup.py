@@ -0,0 +1,146 @@
+"""Tests for lineup evaluation.
+
+This module checks that the batched numba path of evaluate_lineup.py
+(_evaluate_lineups_numba) gives the same results as evaluate_lineup, lineup
+by lineup. Without numba the same kernel runs as plain Python.
+"""
+
+import importlib.util
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+module_path = PROJECT_ROOT / "code" / "evaluate_lineup.py"
+
+spec = importlib.util.spec_from_file_location("evaluate_lineup", str(module_path))
+if spec is None or spec.loader is None:
+    raise ImportError(f"Could not create a valid ModuleSpec for {module_path}")
+module = importlib.util.module_from_spec(spec)
+sys.modules[spec.name] = module
+spec.loader.exec_module(module)
+
+
+# Test Fixtures
+
+
+@pytest.fixture
+def squad_df():
+    """Create a 15-player squad: ids 1-2 GK, 3-7 DEF, 8-12 MID, 13-15 FWD."""
+    positions = ["GK"] * 2 + ["DEF"] * 5 + ["MID"] * 5 + ["FWD"] * 3
+    return pd.DataFrame({"player_id": range(1, 16), "position": positions})
+
+
+@pytest.fixture
+def points_mat():
+    """Create actual points for GW 1-2 and a single record in GW 4.
+
+    GW 1 has no record for players 7 and 14, GW 3 has no records at all and
+    GW 9 lies outside the matrix. Player 40 (not in the squad) sets the width.
+    """
+    rows = []
+    for gw in (1, 2):
+        for pid in range(1, 16):
+            if gw == 1 and pid in (7, 14):
+                continue
+            rows.append({"player_id": pid, "gw": gw, "total_points": (pid * gw) % 9})
+    rows.append({"player_id": 3, "gw": 2, "total_points": 4})  # double gameweek
+    rows.append({"player_id": 40, "gw": 4, "total_points": 6})
+    return module.build_points_matrix(pd.DataFrame(rows))
+
+
+def _lineup(gw, xi_ids, bench_gk_id, bench_out_ids):
+    return {
+        "gw": gw,
+        "xi_ids": xi_ids,
+        "bench_gk_id": bench_gk_id,
+        "bench_out_ids": bench_out_ids,
+    }
+
+
+XI_442 = [1, 3, 4, 5, 6, 8, 9, 10, 11, 13, 14]
+
+LINEUPS = [
+    # Valid 4-4-2, with and without actuals for some players
+    _lineup(1, XI_442, 2, [7, 12, 15]),
+    _lineup(2, XI_442, 2, [7, 12, 15]),
+    # Duplicate id in the XI
+    _lineup(1, [1, 3, 3, 5, 6, 8, 9, 10, 11, 13, 14], 2, [7, 12, 15]),
+    # Duplicate between XI and bench, and within the bench
+    _lineup(2, XI_442, 2, [7, 12, 13]),
+    _lineup(2, XI_442, 2, [15, 15, 12]),
+    # Invalid formations: two GKs in the XI, and 2-5-3
+    _lineup(1, [1, 2, 3, 4, 5, 8, 9, 10, 11, 13, 14], 6, [7, 12, 15]),
+    _lineup(2, [1, 3, 4, 8, 9, 10, 11, 12, 13, 14, 15], 2, [5, 6, 7]),
+    # GW without actuals, inside and outside the matrix
+    _lineup(3, XI_442, 2, [7, 12, 15]),
+    _lineup(9, XI_442, 2, [7, 12, 15]),
+    # Ids outside the squad, inside and outside the points matrix
+    _lineup(4, [1, 3, 4, 5, 6, 8, 9, 10, 11, 13, 40], 2, [7, 12, 15]),
+    _lineup(2, [1, 3, 4, 5, 6, 8, 9, 10, 11, 13, 99], 2, [7, 12, 500]),
+]
+
+
+def test_numba_batch_matches_evaluate_lineup(squad_df, points_mat):
+    """Test that _evaluate_lineups_numba matches evaluate_lineup on regular lineups."""
+    squad_ids, squad_codes = module.build_squad_arrays(squad_df)
+    pos_codes = module.build_position_codes(squad_df)
+
+    batch = module._evaluate_lineups_numba(
+        LINEUPS, squad_ids, squad_codes, points_mat, pos_codes
+    )
+
+    assert len(batch) == len(LINEUPS)
+    for lineup, result in zip(LINEUPS, batch):
+        expected = module.evaluate_lineup(
+            lineup, squad_ids, squad_codes, points_mat, pos_codes
+        )
+        assert result == expected, f"Mismatch for lineup {lineup}"
+
+
+def test_duplicate_ids_count_once(squad_df, points_mat):
+    """Test that a repeated XI or bench id is counted once, in both paths."""
+    squad_ids, squad_codes = module.build_squad_arrays(squad_df)
+    pos_codes = module.build_position_codes(squad_df)
+    xi_dup = [1, 3, 3, 5, 6, 8, 9, 10, 11, 13, 13]
+    lineup = _lineup(2, xi_dup, 2, [15, 15, 12])
+
+    distinct_xi = module.compute_team_points(sorted(set(xi_dup)), points_mat, 2)
+    assert module.compute_team_points(xi_dup, points_mat, 2) == distinct_xi
+    assert module.compute_bench_loss(
+        xi_dup, [15, 15, 12], points_mat, 2
+    ) == module.compute_bench_loss(sorted(set(xi_dup)), [15, 15, 12], points_mat, 2)
+
+    expected = module.evaluate_lineup(
+        lineup, squad_ids, squad_codes, points_mat, pos_codes
+    )
+    (batched,) = module._evaluate_lineups_numba(
+        [lineup], squad_ids, squad_codes, points_mat, pos_codes
+    )
+    assert expected["team_points_xi"] == distinct_xi
+    assert batched == expected
+
+
+def test_numba_batch_leaves_irregular_lineups(squad_df, points_mat):
+    """Test that lineups without 11 XI / bench GK / 3 bench are left to the caller."""
+    squad_ids, squad_codes = module.build_squad_arrays(squad_df)
+    pos_codes = module.build_position_codes(squad_df)
+    irregular = [
+        _lineup(1, XI_442[:10], 2, [7, 12, 15]),
+        _lineup(1, XI_442, None, [7, 12, 15]),
+        _lineup(1, XI_442, 2, [7, 12]),
+    ]
+
+    batch = module._evaluate_lineups_numba(
+        irregular + LINEUPS[:1], squad_ids, squad_codes, points_mat, pos_codes
+    )
+
+    assert batch[:3] == [None, None, None]
+    assert batch[3] is not None
+
+
+if __name__ == "__main__":
+    # Allow running tests directly with: python tests/test_evaluate_lineup.py
+    pytest.main([__file__, "-v"])
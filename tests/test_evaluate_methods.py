@@ -0,0 +1,146 @@
+"""Tests for the method evaluation helpers.
+
+This module tests calculate_metrics' Spearman correlation against
+scipy.stats.spearmanr, with and without numba, and the merged-frame Parquet
+cache of evaluate_methods.py: its key and the pruning of older entries.
+"""
+
+import importlib.util
+import os
+import sys
+import types
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import spearmanr
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+module_path = PROJECT_ROOT / "code" / "evaluate_methods.py"
+
+# evaluate_methods imports model helpers from make_predictions that this tree
+# does not define; none of the tested functions use them
+if "make_predictions" not in sys.modules:
+    _placeholder = types.ModuleType("make_predictions")
+    for _name in ("load_and_prepare_data", "train_model", "generate_predictions"):
+        setattr(_placeholder, _name, None)
+    sys.modules["make_predictions"] = _placeholder
+
+spec = importlib.util.spec_from_file_location("evaluate_methods", str(module_path))
+if spec is None or spec.loader is None:
+    raise ImportError(f"Could not create a valid ModuleSpec for {module_path}")
+module = importlib.util.module_from_spec(spec)
+sys.modules[spec.name] = module
+spec.loader.exec_module(module)
+
+
+# Test Fixtures
+
+
+@pytest.fixture
+def cache_dirs(tmp_path, monkeypatch):
+    """Point DATA_DIR and OUT_DIR to a temporary directory with one season."""
+    monkeypatch.setattr(module, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(module, "OUT_DIR", tmp_path)
+    (tmp_path / "merged_gw_s1.csv").write_text("element,GW,total_points\n1,3,5\n")
+    pred_file = tmp_path / "predictions_gw3.json"
+    pred_file.write_text('{"model_version": "rf-1", "players": []}')
+    return tmp_path, pred_file
+
+
+# Test Cases
+
+
+@pytest.mark.parametrize("use_numba", [True, False])
+def test_calculate_metrics_spearman_matches_scipy(monkeypatch, use_numba):
+    """Test that Spearman matches spearmanr, with ties, NaN and constant input."""
+    if use_numba:
+        pytest.importorskip("numba")
+        assert module.njit is not None
+    else:
+        monkeypatch.setattr(module, "njit", None)  # rankdata fallback
+
+    rng = np.random.default_rng(11)
+    cases = [
+        (np.array([1.0, 2.0, 2.0, 3.0]), np.array([1.0, 3.0, 2.0, 2.0])),
+        (np.array([5.0, 5.0, 5.0]), np.array([1.0, 2.0, 3.0])),  # constant
+        (np.array([1.0, np.nan, 3.0, 4.0]), np.array([2.0, 1.0, np.nan, 0.0])),
+    ]
+    for n in (2, 3, 10, 200):
+        # FPL-like integer scores: many ties, some missing values
+        p = rng.integers(-2, 12, n).astype(float)
+        a = rng.integers(0, 4, n).astype(float)
+        p[rng.random(n) < 0.1] = np.nan
+        cases.append((p, a))
+
+    for predictions, actuals in cases:
+        result = module.calculate_metrics(predictions, actuals)["spearman"]
+
+        mask = ~(np.isnan(predictions) | np.isnan(actuals))
+        p, a = predictions[mask], actuals[mask]
+        if p.size < 2 or np.ptp(p) == 0 or np.ptp(a) == 0:
+            assert np.isnan(result)
+        else:
+            assert result == pytest.approx(spearmanr(p, a)[0], abs=1e-12)
+
+
+def test_cache_key_follows_prediction_content(cache_dirs):
+    """Test that identical predictions hit and changed predictions miss."""
+    _, pred_file = cache_dirs
+    key = module._merged_cache_path("s1", 3, "rf", pred_file)
+
+    pred_file.write_text('{"model_version": "rf-1", "players": []}')
+    assert module._merged_cache_path("s1", 3, "rf", pred_file) == key
+
+    pred_file.write_text('{"model_version": "rf-2", "players": []}')
+    assert module._merged_cache_path("s1", 3, "rf", pred_file) != key
+
+
+def test_cache_key_follows_actuals_file(cache_dirs):
+    """Test that a corrected or extended merged_gw CSV changes the key."""
+    data_dir, pred_file = cache_dirs
+    key = module._merged_cache_path("s1", 3, "rf", pred_file)
+
+    csv_path = data_dir / "merged_gw_s1.csv"
+    csv_path.write_text("element,GW,total_points\n1,3,5\n2,3,1\n")
+    os.utime(csv_path, ns=(0, 1_000_000_000))
+    assert module._merged_cache_path("s1", 3, "rf", pred_file) != key
+
+
+def test_cache_key_separates_gw_and_method(cache_dirs):
+    """Test that season, gw and method are part of the key."""
+    _, pred_file = cache_dirs
+    paths = {
+        module._merged_cache_path(season, gw, method, pred_file)
+        for season, gw, method in [("s1", 3, "rf"), ("s1", 30, "rf"), ("s1", 3, "pos")]
+    }
+    assert len(paths) == 3
+
+
+def test_write_merged_cache_prunes_only_same_gameweek(cache_dirs):
+    """Test that a new entry replaces only older entries of its (season, gw, method)."""
+    pytest.importorskip("pyarrow")
+    out_dir, _ = cache_dirs
+    frame = pd.DataFrame({"player_id": np.array([1], dtype="int32")})
+
+    def entry(gw, method, digest):
+        return out_dir / f"merged_s1_gw{gw}_{method}_{digest}.parquet"
+
+    old = entry(3, "rf", "0" * 12)
+    keep = [entry(30, "rf", "1" * 12), entry(3, "rf_rank", "2" * 12)]
+    for path in [old, *keep]:
+        module._write_merged_cache(frame, path)
+
+    new = entry(3, "rf", "3" * 12)
+    module._write_merged_cache(frame, new)
+
+    assert not old.exists()
+    assert new.exists()
+    assert all(path.exists() for path in keep)
+    pd.testing.assert_frame_equal(pd.read_parquet(new), frame)
+
+
+if __name__ == "__main__":
+    # Allow running tests directly with: python tests/test_evaluate_methods.py
+    pytest.main([__file__, "-v"])
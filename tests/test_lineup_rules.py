@@ -6,6 +6,7 @@ This module tests that the pick_lineup function correctly enforces FPL rules:
 - XI must follow a valid formation from the allowed set
 """
 
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -501,6 +502,48 @@ def test_formation_in_allowed_list():
     ), f"ALLOWED_FORMATIONS mismatch. Expected subset: {expected}, Actual: {actual}"
 
 
+def test_batched_team_builders_follow_rules():
+    """Test that build_teams/choose_best_formations respect slots, budget and clubs."""
+    rng = np.random.default_rng(7)
+    n = 60
+    candidates = pd.DataFrame(
+        {
+            "player_id": rng.permutation(n) + 1,
+            "position": rng.choice(["GK", "DEF", "MID", "FWD"], n),
+            "price": rng.choice([4.5, 5.0, 6.5, 9.0, 12.0], n),
+            "club": rng.choice(list("ABCDEF"), n),
+            "p90_last": rng.choice([1.0, 2.0, np.nan], n),
+            "score_a": rng.choice([0.0, 1.0, 2.5, np.nan], n),
+            "score_b": rng.choice([0.0, 3.0, 4.0], n),
+        }
+    )
+    score_cols = ["score_a", "score_b"]
+
+    def check(team, formation):
+        xi = team["start_xi"]
+        counts = pd.Series([p["position"] for p in xi]).value_counts().to_dict()
+        assert counts == {k: v for k, v in POS_SLOTS[formation].items() if v}
+        assert sum(p["price"] for p in xi) <= 100.0 + 1e-9
+        assert max(pd.Series([p["club"] for p in xi]).value_counts()) <= 3
+        xi_ids = {p["player_id"] for p in xi}
+        assert len(xi_ids) == 11
+        assert not xi_ids & {p["player_id"] for p in team["bench"]}
+        assert team["captain"] == xi[0]
+
+    batched = module.choose_best_formations(candidates, score_cols, ALLOWED_FORMATIONS)
+    fixed = module.build_teams(candidates, score_cols, "4-4-2")
+    for col, (form, team), fixed_team in zip(score_cols, batched, fixed):
+        check(team, form)
+        check(fixed_team, "4-4-2")
+        # Single-score builders delegate to the batched ones
+        frame = candidates.assign(pred_points=candidates[col])
+        ref_form, ref_team = module.choose_best_formation(frame, ALLOWED_FORMATIONS)
+        assert ref_form == form
+        assert [p["player_id"] for p in ref_team["start_xi"]] == [
+            p["player_id"] for p in team["start_xi"]
+        ]
+
+
 if __name__ == "__main__":
     # Allow running tests directly with: python tests/test_lineup_rules.py
     pytest.main([__file__, "-v"])
@@ -4,6 +4,7 @@ This module tests the opponent_strength function which computes
 defensive strength metrics for opponent teams.
 """
 
+import importlib.util
 import sys
 from pathlib import Path
 
@@ -244,6 +245,46 @@ def test_float_precision():
     assert abs(strength - rounded) < 1e-10, "Strength should have reasonable precision"
 
 
+def _load_ab_module():
+    """Load code/evaluate_ab_opp_strength.py as a module."""
+    path = PROJECT_ROOT / "code" / "evaluate_ab_opp_strength.py"
+    spec = importlib.util.spec_from_file_location("evaluate_ab_opp_strength", path)
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = mod
+    spec.loader.exec_module(mod)
+    return mod
+
+
+@pytest.mark.parametrize("use_kernel", [True, False])
+def test_grouped_shift_roll_stays_within_player(monkeypatch, use_kernel):
+    """Test that rolling features only use the same player's earlier rows."""
+    ab = _load_ab_module()
+    if not use_kernel:
+        monkeypatch.setattr(ab, "njit", None)  # pandas fallback
+    elif ab.njit is None:
+        monkeypatch.setattr(ab, "njit", object())  # kernel runs as plain Python
+
+    rng = np.random.default_rng(3)
+    n = 60
+    df = pd.DataFrame(
+        {
+            "player_id": rng.choice([1.0, 2.0, 5.0, 9.0, np.nan], n),
+            "gw": rng.permutation(n) + 1,
+            "points": rng.choice([0.0, 1.0, 2.0, 6.0, 13.0, np.nan], n),
+        },
+        index=rng.permutation(n) + 100,
+    )
+    out = df.sort_values(["player_id", "gw"])
+
+    result = ab._grouped_shift_roll(out, "player_id", "points", 3)
+
+    expected = out.groupby("player_id")["points"].transform(
+        lambda s: s.shift(1).rolling(3, min_periods=1).mean()
+    )
+    np.testing.assert_allclose(result, expected.to_numpy(dtype=float))
+    assert np.isnan(result[out["player_id"].isna().to_numpy()]).all()
+
+
 if __name__ == "__main__":
     # Allow running tests directly with: python tests/test_opponent_strength.py
     pytest.main([__file__, "-v"])